@@ -5,19 +5,34 @@ This package contains the Google ADK-based implementation of the competitive
 intelligence report system with COMMERCIAL INSURANCE segment focus.
 """
 
-from .root_agent import CompetitiveIntelligenceRootAgent, create_agent
-from .tools import (
-    FindLatestQuarterTool,
-    ValidateDataTool,
-    FinancialMetricsTool,
-    CompetitivePositioningTool,
-    StrategicInitiativesTool,
-    RiskOutlookTool
-)
-from .financial_metrics_agent import FinancialMetricsAgent
-from .competitive_positioning_agent import CompetitivePositioningAgent
-from .strategic_initiatives_agent import StrategicInitiativesAgent
-from .risk_outlook_agent import RiskOutlookAgent
+import importlib
+
+# Public names and the submodules that define them. They are imported on first
+# access (PEP 562), so importing a light submodule such as .config does not load
+# the ADK/Vertex AI stack.
+_EXPORTS = {
+    'CompetitiveIntelligenceRootAgent': '.root_agent',
+    'create_agent': '.root_agent',
+    'FindLatestQuarterTool': '.tools',
+    'ValidateDataTool': '.tools',
+    'FinancialMetricsTool': '.tools',
+    'CompetitivePositioningTool': '.tools',
+    'StrategicInitiativesTool': '.tools',
+    'RiskOutlookTool': '.tools',
+    'FinancialMetricsAgent': '.financial_metrics_agent',
+    'CompetitivePositioningAgent': '.competitive_positioning_agent',
+    'StrategicInitiativesAgent': '.strategic_initiatives_agent',
+    'RiskOutlookAgent': '.risk_outlook_agent',
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'CompetitiveIntelligenceRootAgent',
@@ -8,12 +8,12 @@ Excludes Personal Lines analysis.
 from typing import Dict, List, Optional
 import json
 import asyncio
+import itertools
 import os
 import vertexai
 from google.adk.agents import Agent
 from google.adk.tools.vertex_ai_search_tool import VertexAiSearchTool
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
 from .config import (
@@ -26,6 +26,11 @@ from .config import (
     DATA_STORE_ID,
     COMPANIES
 )
+from .rate_limiting import vertex_limiter
+from .sessions import shared_session_service
+
+# Suffixes that keep session IDs unique across concurrent runs in this process
+_session_ids = itertools.count()
 
 
 class CompetitivePositioningAgent:
@@ -81,8 +86,8 @@ Search datastore for SEC filings and earnings call transcripts.""",
             tools=[VertexAiSearchTool(data_store_id=datastore_path)]
         )
         
-        # Create session service and runner
-        self.session_service = InMemorySessionService()
+        # Runner on the process-wide session service
+        self.session_service = shared_session_service()
         self.runner = Runner(
             agent=self.agent,
             app_name=APP_NAME,
@@ -154,9 +159,8 @@ Search datastore for SEC filings and earnings call transcripts.""",
 Return ONLY valid JSON with citations."""
         
         try:
-            # Create session with timestamp for uniqueness
-            import time
-            session_id = f"competitive_{year}_Q{quarter}_{int(time.time()*1000)}"
+            # Create session with a process-unique suffix
+            session_id = f"competitive_{year}_Q{quarter}_{next(_session_ids)}"
             session = await self.session_service.create_session(
                 app_name=APP_NAME,
                 user_id="system",
@@ -170,8 +174,10 @@ Return ONLY valid JSON with citations."""
             )
             
             # Run and get final response with timeout
-            result_text = ""
+            # Text parts of the latest final response, joined once after the run
+            final_text_parts: list[str] = []
             try:
+                await vertex_limiter().acquire()
                 async with asyncio.timeout(300):  # 5 minute timeout
                     async for event in self.runner.run_async(
                         user_id="system",
@@ -180,8 +186,7 @@ Return ONLY valid JSON with citations."""
                     ):
                         if event.is_final_response() and event.content and event.content.parts:
                             # Extract text from all text parts (may also have function_call parts)
-                            text_parts = [part.text for part in event.content.parts if hasattr(part, 'text') and part.text]
-                            result_text = ''.join(text_parts)
+                            final_text_parts = [part.text for part in event.content.parts if hasattr(part, 'text') and part.text]
             except asyncio.TimeoutError:
                 print(f"  ✗ Timeout after 300 seconds")
                 return {
@@ -189,6 +194,7 @@ Return ONLY valid JSON with citations."""
                     "error": "Agent timeout after 300 seconds"
                 }
             
+            result_text = ''.join(final_text_parts)
             if not result_text:
                 print(f"  ✗ Empty response from agent")
                 return {
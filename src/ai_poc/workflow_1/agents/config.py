@@ -21,7 +21,10 @@ MAX_RETRIES = 3  # Retry failed requests up to 3 times
 RETRY_DELAY = 2  # Wait 2 seconds between retries
 
 # Parallel Processing Configuration
-MAX_CONCURRENT_EXTRACTIONS = 3  # Process max 3 companies at a time to avoid API rate limits
+MAX_CONCURRENT_EXTRACTIONS = 3  # Extraction runs (company groups) in flight at once to avoid API rate limits
+EXTRACTION_BATCH_SIZE = 4  # Companies extracted together in one agent run
+MAX_CONCURRENT_INITIATIVE_QUERIES = 6  # Per-company strategic initiative searches in flight
+VERTEX_REQUESTS_PER_SECOND = 5  # Agent runs started per second across all agents (shared limiter)
 
 # Generation Configuration
 GENERATION_CONFIG = {
@@ -45,9 +48,14 @@ COMPANIES = [
 REPORT_OUTPUT_DIR = "generated_reports"
 REPORT_FORMAT = "html"  # Options: markdown, html, json
 
+# Response Cache Configuration (used only when diskcache is installed)
+RESPONSE_CACHE_DIR = ".cache/agent_responses"
+RESPONSE_CACHE_TTL = 7 * 24 * 3600  # Seconds a cached per-company response stays valid
+
 # Agent System Configuration
 ROOT_AGENT_NAME = "CompetitiveIntelligenceOrchestrator"
 ROOT_AGENT_DESCRIPTION = "Orchestrates competitive intelligence analysis for The Hartford across 7 major commercial insurers"
 
 # Session Configuration
 APP_NAME = "competitive_intelligence_system"
+SESSION_DB_URL = None  # e.g. "sqlite:///sessions.db" to persist agent sessions across runs
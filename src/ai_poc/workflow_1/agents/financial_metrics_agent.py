@@ -5,11 +5,19 @@ Extracts key financial metrics for the COMMERCIAL INSURANCE segment.
 Excludes Personal Lines, Life, and other non-commercial segments.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 import json
 import asyncio
+import hashlib
+import itertools
+import logging
 import os
+import random
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from types import MappingProxyType
 import vertexai
+from google.api_core.exceptions import DeadlineExceeded, ResourceExhausted, ServiceUnavailable
 from google.adk.agents import Agent
 from google.adk.tools.vertex_ai_search_tool import VertexAiSearchTool
 from google.adk.runners import Runner
@@ -24,8 +32,248 @@ from .config import (
     GCP_PROJECT_ID, 
     GCP_LOCATION, 
     DATA_STORE_LOCATION,
-    DATA_STORE_ID
+    DATA_STORE_ID,
+    EXTRACTION_BATCH_SIZE,
+    MAX_CONCURRENT_EXTRACTIONS,
+    REQUEST_TIMEOUT
 )
+from .rate_limiting import vertex_limiter
+
+# orjson parses large agent responses considerably faster; fall back to stdlib json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Responses at least this long are parsed on a worker thread instead of the event loop
+_THREAD_PARSE_THRESHOLD = 16 * 1024
+
+logger = logging.getLogger(__name__)
+
+# Transient API errors that are retried rather than counted as a failed iteration
+_TRANSIENT_ERRORS = (ResourceExhausted, DeadlineExceeded, ServiceUnavailable)
+
+# Prompt sent for each iterative search; only the query varies
+_SEARCH_PROMPT_TEMPLATE = """Search for: {query}
+
+Return the first 2000 characters of the most relevant search results.
+Focus on finding segment financial tables and metrics from 10-Q filings."""
+
+# Follow-up turn sent when a response parses but lacks the expected structure
+_REPAIR_PROMPT_TEMPLATE = """Your previous response did not match the required structure.
+
+Return ONLY the JSON object with keys "ticker", "year", "quarter" and a "commercial_metrics" object
+mapping each metric name to {{"value": ..., "citation": ...}}. Do not search again.
+
+Here is what you sent:
+{response}"""
+
+# Per-company extraction prompt; filled in with str.format by _make_extraction_content
+_EXTRACTION_PROMPT_TEMPLATE = """Extract commercial segment metrics for {ticker} from 10-Q for THREE MONTHS ENDED {period_end}, {year}.
+
+**SEARCH STRATEGY (try these queries with year and quarter):**
+1. "{ticker} {year} Q{quarter} commercial segment business insurance"
+2. "{ticker} {year} Q{quarter} underwriting results combined ratio"
+3. "{ticker} {year} Q{quarter} net written premiums earned premiums"
+4. "{ticker} {year} Q{quarter} segment information financial results"
+
+**WHERE TO FIND DATA:**
+{search_hint}
+
+**EXTRACT 8 METRICS:**
+1. Net Written Premiums ($M) - from segment table (absolute dollar amount)
+2. Net Written Premiums Growth (%) - compare to prior year quarter
+3. Combined Ratio (%) - from segment results or MD&A
+4. Loss Ratio (%) - if separately disclosed
+5. Expense Ratio (%) - if separately disclosed
+6. Underwriting Income ($M) - segment income before tax
+7. Catastrophe Losses ($M) - if disclosed for commercial
+8. Net Earned Premiums ($M) - from segment table (for revenue context)
+
+**IMPORTANT:**
+- Make MULTIPLE searches - each metric may be in different sections
+- The 10-Q filing EXISTS in the datastore for Q{quarter} {year}
+- Look in: Segment tables (Notes), MD&A section
+- If not found immediately, try different search terms
+- Combined ratio often in MD&A "Results of [Segment Name]"
+- Net Written Premiums and Net Earned Premiums are DOLLAR AMOUNTS in millions
+
+**RETURN JSON:**
+{{
+  "ticker": "{ticker}",
+  "year": {year},
+  "quarter": {quarter},
+  "commercial_metrics": {{
+    "Net Written Premiums": {{"value": 5400, "citation": "[Source: {ticker} 10-Q Q{quarter} {year}, Note 3]"}},
+    "Net Written Premiums Growth": {{"value": 8.5, "citation": "[Source: {ticker} 10-Q Q{quarter} {year}, MD&A]"}},
+    "Combined Ratio": {{"value": 94.5, "citation": "[Source: ...]"}},
+    "Loss Ratio": {{"value": 62.3, "citation": "[Source: ...]"}},
+    "Expense Ratio": {{"value": 32.2, "citation": "[Source: ...]"}},
+    "Underwriting Income": {{"value": 450, "citation": "[Source: ...]"}},
+    "Catastrophe Losses": {{"value": 125, "citation": "[Source: ...]"}},
+    "Net Earned Premiums": {{"value": 5100, "citation": "[Source: ...]"}}
+  }}
+}}
+
+**CRITICAL OUTPUT REQUIREMENTS:**
+- Return ONLY the JSON object above
+- DO NOT include any conversational text
+- DO NOT ask questions
+- DO NOT say the filing doesn't exist - it does
+- If you cannot find data after searching, use null: {{"value": null, "citation": "Not Disclosed in 10-Q"}}
+- Start response with {{ and end with }}
+- No markdown, no code blocks, no explanations - JUST JSON"""
+
+
+# Shared empty feedback/issues value for results with nothing to report
+_EMPTY: tuple = ()
+
+
+@dataclass(frozen=True, slots=True)
+class SearchScore:
+    """Quality score for one search result, with feedback for query refinement."""
+    score: float
+    quality: str
+    feedback: Sequence[str]
+    issues: Sequence[str]
+
+
+@lru_cache(maxsize=64)
+def _make_search_content(query: str) -> types.Content:
+    """Build (and memoize) the user message for a search query, reused when a query recurs."""
+    return types.Content(
+        role='user',
+        parts=[types.Part(text=_SEARCH_PROMPT_TEMPLATE.format(query=query))]
+    )
+
+
+@lru_cache(maxsize=64)
+def _make_extraction_content(ticker: str, year: int, quarter: int) -> types.Content:
+    """Build (and memoize) the extraction message for a company period, reused across retries and reruns."""
+    search_hint = _SEGMENT_GUIDANCE.get(ticker, f"Search for commercial insurance segment data for {ticker}")
+    # Map quarter to period end date for search
+    period_end = _QUARTER_END_DATES.get(quarter, f"Q{quarter}")
+    return types.Content(
+        role='user',
+        parts=[types.Part(text=_EXTRACTION_PROMPT_TEMPLATE.format(
+            ticker=ticker,
+            year=year,
+            quarter=quarter,
+            period_end=period_end,
+            search_hint=search_hint
+        ))]
+    )
+
+
+@lru_cache(maxsize=64)
+def _result_cache_key(ticker: str, year: int, quarter: int) -> tuple:
+    """Key a company period's result by its extraction prompt, so prompt edits invalidate it."""
+    prompt = _make_extraction_content(ticker, year, quarter).parts[0].text
+    return ticker, year, quarter, hashlib.blake2b(prompt.encode(), digest_size=8).hexdigest()
+
+
+@lru_cache(maxsize=32)
+def _prior_year_strs(year: int) -> tuple[str, ...]:
+    """Return the two years preceding ``year`` as strings (used to flag stale results)."""
+    return tuple(str(y) for y in range(year - 2, year))
+
+
+# Company-specific search guidance for metric extraction prompts
+_SEGMENT_GUIDANCE = MappingProxyType({
+    "TRV": "Search TRV 10-Q Item 2 MD&A  for section titled 'Business Insurance' and subsection 'Results of Business Insurance'. Look for the results table with columns for 'Three Months Ended September 30' showing current year and prior year. Key line items under Revenues: Earned premiums, Net investment income, Fee income, Other revenues, Total revenues. Then find: Total claims and expenses, Segment income before income taxes, Segment income. At the bottom of the table find the ratios: Loss and loss adjustment expense ratio, Underwriting expense ratio, Combined ratio. Catastrophe losses are mentioned in the Overview narrative text that follows the table (e.g., 'Catastrophe losses in the third quarters of 2025 and 2024 were $139 million and $340 million').",
+    "HIG": "Search HIG 10-Q Item 2 MD&A for section titled 'Reportable Segment And Corporate Operating Summaries' with subsection 'Business Insurance - Results of Operations'. CRITICAL: Find the 'Underwriting Ratios' table at the bottom of the section. This table shows columns for 'Three Months Ended September 30' (current and prior year). Extract the Combined Ratio, Loss and loss adjustment expense ratio, and Expense ratio directly from this Underwriting Ratios table - DO NOT calculate or use ratios from other tables. For Q3 2025, use the 2025 column value. Also find the 'Underwriting Summary' table above it for: Written premiums, Net earned premiums, Current accident year catastrophes (for cat losses), Underwriting gain/loss (for underwriting income). The Underwriting Ratios table is the authoritative source for all ratios.",
+    "AIG": "Search AIG 10-Q Item 2 MD&A   for section titled 'NORTH AMERICA COMMERCIAL RESULTS' under 'Business Segment Operations' and 'General Insurance'. Look for the 'Underwriting results' table with columns for 'Three Months Ended September 30' showing current year and prior year. Key line items: Net premiums written, Increase in unearned premiums, Net premiums earned, Losses and loss adjustment expenses incurred, Policy acquisition costs, Other acquisition expenses, General operating expenses, Underwriting income. Find ratios: Loss ratio, Acquisition ratio, General operating expense ratio, Expense ratio, Combined ratio. Below the main table find 'Adjustments for accident year loss ratio, as adjusted and accident year combined ratio, as adjusted' showing Catastrophic losses and Prior year development. Also look for 'CAV combined ratio' line (combined ratio excluding catastrophe losses).",
+    "CB": "Search CB 10-Q Item 2 MD&A  for section titled 'North America Commercial P&C Insurance'. Look for the results table with columns for 'Three Months Ended September 30' showing current year and prior year. Key line items: Net premiums written, Net premiums earned, Losses and loss expenses, Policy acquisition costs, Administrative expenses, Underwriting income, Segment income. At the bottom find ratios: Combined ratio, Loss and loss expense ratio, Policy acquisition cost ratio, Administrative expense ratio, Combined ratio (CAV combined ratio excluding catastrophe losses). Below the main table, find 'Net Catastrophe Losses and Prior Period Development' table showing 'Net catastrophe losses' and 'Favorable prior period development'. Also find 'Production by Size - Net premiums written' table showing Major Accounts & Specialty vs Commercial breakdown.",
+    "CNA": "Search CNA 10-Q Item 2 MD&A   for section titled 'Commercial'. Look for table with header 'Periods ended September 30' with columns for 'Three Months' and 'Nine Months' showing current year (2025) and prior year (2024). Key line items: Gross written premiums, Net written premiums, Net earned premiums, Underwriting gain (loss), Net investment income, Core income. Below the main table find 'Other performance metrics' section showing: Loss ratio, Expense ratio, Dividend ratio, Combined ratio. Then find adjustments section showing: 'Less: Effect of catastrophe impacts', 'Less: Effect of (favorable) unfavorable development-related items', 'Underlying combined ratio', 'Underlying loss ratio'. Also find 'Rate' section showing Renewal premium change and Retention. The 'Three Month Comparison' narrative describes drivers of combined ratio changes.",
+    "WRB": "Search for 'Insurance' segment in the Business Segments Note (Note 22). W.R. Berkley reports commercial business under the 'Insurance' segment. Use Insurance segment revenues (earned premiums), expenses (losses and loss expenses), and pre-tax income as commercial metrics. The segment table shows Insurance and Reinsurance & Monoline Excess columns - use the Insurance column.",
+    "BRK.B": "Search BRK.B 10-Q for Note 24 'Business segment data' showing the underwriting activities table. This table has COLUMNS for: GEICO, BH Primary, BHRG, Total Underwriting, Investment Income, and Total. Extract data from the 'BH Primary' COLUMN only (NOT GEICO or BHRG). Key rows: Revenues, Losses and loss adjustment expenses ('LAE'), Life annuity and health benefits, Other segment items, Total costs and expenses, and Earnings before income taxes. The BH Primary column shows Berkshire Hathaway Primary Group commercial insurance operations. Calculate Combined Ratio = (Losses and LAE + Other segment items) / Revenues × 100. Use 'Earnings before income taxes' from BH Primary column as underwriting income."
+})
+
+# Segment keywords expected in good search results, per ticker
+_SEGMENT_KEYWORDS = MappingProxyType({
+    "TRV": ("Business Insurance", "segment"),
+    "HIG": ("Business Insurance", "Commercial Lines"),
+    "AIG": ("North America Commercial", "NOT International"),
+    "CB": ("North America Commercial",),
+    "CNA": ("Commercial", "segment"),
+    "WRB": ("Insurance segment",),
+    "BRK.B": ("BH Primary",)
+})
+_DEFAULT_SEGMENT_KEYWORDS = ("commercial", "segment")
+
+# Lowercased byte forms of the scoring keywords
+_SEGMENT_KEYWORDS_B = MappingProxyType({
+    ticker: tuple(kw.lower().encode("ascii") for kw in keywords)
+    for ticker, keywords in _SEGMENT_KEYWORDS.items()
+})
+_DEFAULT_SEGMENT_KEYWORDS_B = tuple(kw.encode("ascii") for kw in _DEFAULT_SEGMENT_KEYWORDS)
+_METRIC_KEYWORDS_B = (b"premiums", b"combined ratio", b"loss ratio", b"underwriting", b"revenue")
+
+# Map quarter to period end date for search
+_QUARTER_END_DATES = MappingProxyType({
+    1: "March 31",
+    2: "June 30",
+    3: "September 30",
+    4: "December 31"
+})
+
+def _error_result(ticker: str, year: int, quarter: int, error: str, **extra) -> Dict:
+    """Build the canonical error result for a failed company extraction."""
+    return {
+        "ticker": ticker,
+        "year": year,
+        "quarter": quarter,
+        "commercial_metrics": {},
+        "status": "error",
+        "error": error,
+        **extra
+    }
+
+
+def _json_object_end(text: str, start: int) -> int:
+    """
+    Find the end of the JSON object that opens at text[start].
+    
+    Tracks brace depth while skipping braces inside string literals, so a
+    complete object can be detected before the rest of the response is parsed.
+    
+    Returns:
+        Index just past the matching closing brace, or -1 if the object is incomplete
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return -1
+
+
+async def _parse_json(text: str):
+    """Parse an agent response, offloading large payloads with asyncio.to_thread."""
+    if len(text) >= _THREAD_PARSE_THRESHOLD:
+        return await asyncio.to_thread(_json_loads, text)
+    return _json_loads(text)
+
+
+def _has_metrics_shape(data) -> bool:
+    """Cheap structural check that a parsed response carries a commercial_metrics object."""
+    return isinstance(data, dict) and isinstance(data.get("commercial_metrics"), dict)
 
 
 class FinancialMetricsAgent:
@@ -51,9 +299,18 @@ class FinancialMetricsAgent:
         "Commercial General Liability Ratio"
     ]
     
+    # Rendered once for interpolation into the system instruction
+    _COMMERCIAL_METRICS_JSON = json.dumps(COMMERCIAL_METRICS, indent=2)
+    
     # Query rewriting configuration
     MAX_QUERY_ITERATIONS = 3
     MIN_QUALITY_SCORE = 0.7  # Threshold for acceptable results
+    MAX_TRANSIENT_RETRIES = 3  # Retries of the same query on quota/5xx errors
+    
+    # Extraction timeout/retry configuration
+    MAX_EXTRACTION_RETRIES = 2  # Retries after a timeout or unparseable response
+    FIRST_EVENT_TIMEOUT = 60  # Seconds to wait for the agent's first event
+    EXTRACTION_TIMEOUT = 300  # Overall cap once the agent has started responding
     
     def __init__(self):
         """
@@ -67,34 +324,70 @@ class FinancialMetricsAgent:
         # Initialize Vertex AI with GCP credentials
         vertexai.init(project=GCP_PROJECT_ID, location=GCP_LOCATION)
         
+        # The ADK agent, runner and session service are built on first use (see below)
+        # so constructing this class does not pay for agents a pipeline never calls
+        
+        # Monotonic suffix that keeps extraction/search session ids unique within the process
+        self._session_counter = itertools.count()
+        # Successful extractions keyed by _result_cache_key, so reruns skip the agent
+        self._results_cache: Dict[tuple, Dict] = {}
+        # Event loop shared by the synchronous wrappers; created on first sync call
+        self._loop_runner: Optional[asyncio.Runner] = None
+        
+        logger.info("[OK] FinancialMetricsAgent initialized (COMMERCIAL SEGMENT ONLY)")
+        logger.info("  Model: %s", DEFAULT_MODEL)
+        logger.info("  Metrics tracked: %d", len(self.COMMERCIAL_METRICS))
+    
+    def _run_sync(self, coro):
+        """Run a coroutine on this agent's persistent event loop (used by the sync wrappers)."""
+        if self._loop_runner is None:
+            self._loop_runner = asyncio.Runner()
+        return self._loop_runner.run(coro)
+    
+    def close(self) -> None:
+        """Close the event loop used by the synchronous wrappers, if one was created."""
+        if self._loop_runner is not None:
+            self._loop_runner.close()
+            self._loop_runner = None
+    
+    def __enter__(self) -> "FinancialMetricsAgent":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    @cached_property
+    def agent(self) -> Agent:
+        """ADK Agent with Vertex AI Search grounding, created on first use."""
         # Construct full datastore path for Vertex AI Search
         datastore_path = (
             f"projects/{GCP_PROJECT_ID}/locations/{DATA_STORE_LOCATION}/"
             f"collections/default_collection/dataStores/{DATA_STORE_ID}"
         )
         
-        # Create ADK Agent with Vertex AI Search grounding
         # Note: Hybrid search with embeddings is automatically enabled when embeddings
         # exist in the datastore (text-embedding-004 already generated during ingestion)
-        self.agent = Agent(
+        return Agent(
             name="financial_metrics_agent",
             model=DEFAULT_MODEL,
             instruction=self._get_system_instruction(),
             description="Extracts COMMERCIAL SEGMENT ONLY financial metrics from SEC filings and earnings calls",
             tools=[VertexAiSearchTool(data_store_id=datastore_path)]
         )
-        
-        # Create session service and runner
-        self.session_service = InMemorySessionService()
-        self.runner = Runner(
+    
+    @cached_property
+    def session_service(self) -> InMemorySessionService:
+        """In-memory ADK session store, created on first use."""
+        return InMemorySessionService()
+    
+    @cached_property
+    def runner(self) -> Runner:
+        """ADK Runner for the agent, created on first use."""
+        return Runner(
             agent=self.agent,
             app_name=APP_NAME,
             session_service=self.session_service
         )
-        
-        print(f"[OK] FinancialMetricsAgent initialized (COMMERCIAL SEGMENT ONLY)")
-        print(f"  Model: {DEFAULT_MODEL}")
-        print(f"  Metrics tracked: {len(self.COMMERCIAL_METRICS)}")
     
     def _get_system_instruction(self) -> str:
         """Returns the system instruction for the ADK agent."""
@@ -194,7 +487,7 @@ For metrics used in the **Commercial Segment Financial Performance comparison ta
 **IMPORTANT**: For financial performance table metrics, search 10-Q/10-K documents thoroughly before falling back to earnings call transcripts. For other analysis sections, both sources have equal weight.
 
 **METRICS TO EXTRACT (Commercial Segment Only):**
-{json.dumps(self.COMMERCIAL_METRICS, indent=2)}
+{self._COMMERCIAL_METRICS_JSON}
 
 **SPECIAL INSTRUCTIONS FOR AIG:**
 - AIG reports "North America Commercial" and "International Commercial" separately
@@ -287,24 +580,28 @@ Return ONLY valid JSON with this exact structure (no markdown code blocks):
             f"{ticker} 10-Q {year} commercial lines segment table"
         ])
     
-    def _score_search_results(self, result_text: str, ticker: str, year: int, quarter: int) -> dict:
+    def _score_search_results(self, result_text: str, ticker: str, year: int, quarter: int) -> SearchScore:
         """
         Score the quality of search results using multiple criteria.
         
         Returns:
-            Dict with score (0-1) and feedback for query refinement
+            SearchScore with score (0-1) and feedback for query refinement
         """
-        score = 0.0
+        # Check 1: Contains correct year (critical)
+        # Without the year the remaining checks can reach at most 0.6, which is
+        # below MIN_QUALITY_SCORE, so skip them and report the miss immediately
+        if str(year) not in result_text:
+            return SearchScore(
+                score=0.0,
+                quality="low",
+                feedback=(f"Search for documents explicitly dated {year}",),
+                issues=(f"Missing year {year}",)
+            )
+
+        score = 0.3
         feedback = []
         issues = []
-        
-        # Check 1: Contains correct year (critical)
-        if str(year) in result_text:
-            score += 0.3
-        else:
-            issues.append(f"Missing year {year}")
-            feedback.append(f"Search for documents explicitly dated {year}")
-        
+
         # Check 2: Contains 10-Q reference (preferred source)
         if "10-Q" in result_text or "10-K" in result_text:
             score += 0.2
@@ -312,19 +609,14 @@ Return ONLY valid JSON with this exact structure (no markdown code blocks):
             issues.append("No 10-Q/10-K reference found")
             feedback.append("Add 'Form 10-Q' to query to prioritize SEC filings")
         
-        # Check 3: Contains segment-specific keywords
-        segment_keywords = {
-            "TRV": ["Business Insurance", "segment"],
-            "HIG": ["Business Insurance", "Commercial Lines"],
-            "AIG": ["North America Commercial", "NOT International"],
-            "CB": ["North America Commercial"],
-            "CNA": ["Commercial", "segment"],
-            "WRB": ["Insurance segment"],
-            "BRK.B": ["BH Primary"]
-        }
+        # Keyword checks run on lowercased ASCII bytes: SEC filing text is
+        # effectively ASCII, and bytes.lower()/`in` avoid Unicode case mapping
+        text_b = result_text.encode("ascii", "ignore").lower()
         
-        expected_keywords = segment_keywords.get(ticker, ["commercial", "segment"])
-        keywords_found = sum(1 for kw in expected_keywords if kw.lower() in result_text.lower())
+        # Check 3: Contains segment-specific keywords
+        expected_keywords = _SEGMENT_KEYWORDS.get(ticker, _DEFAULT_SEGMENT_KEYWORDS)
+        expected_keywords_b = _SEGMENT_KEYWORDS_B.get(ticker, _DEFAULT_SEGMENT_KEYWORDS_B)
+        keywords_found = sum(1 for kw in expected_keywords_b if kw in text_b)
         if keywords_found > 0:
             score += 0.2 * (keywords_found / len(expected_keywords))
         else:
@@ -332,8 +624,7 @@ Return ONLY valid JSON with this exact structure (no markdown code blocks):
             feedback.append(f"Include segment name: {', '.join(expected_keywords)}")
         
         # Check 4: Contains financial metrics keywords
-        metric_keywords = ["premiums", "combined ratio", "loss ratio", "underwriting", "revenue"]
-        metrics_found = sum(1 for kw in metric_keywords if kw.lower() in result_text.lower())
+        metrics_found = sum(1 for kw in _METRIC_KEYWORDS_B if kw in text_b)
         if metrics_found >= 2:
             score += 0.2
         else:
@@ -348,7 +639,7 @@ Return ONLY valid JSON with this exact structure (no markdown code blocks):
         }
         
         wrong_terms = wrong_indicators.get(ticker, [])
-        wrong_year_pattern = [str(y) for y in range(year-2, year) if str(y) in result_text]
+        wrong_year_pattern = [y for y in _prior_year_strs(year) if y in result_text]
         
         if any(term in result_text for term in wrong_terms):
             score -= 0.1
@@ -363,14 +654,14 @@ Return ONLY valid JSON with this exact structure (no markdown code blocks):
         # Normalize score to 0-1 range
         score = max(0.0, min(1.0, score))
         
-        return {
-            "score": score,
-            "feedback": feedback,
-            "issues": issues,
-            "quality": "high" if score >= 0.7 else "medium" if score >= 0.4 else "low"
-        }
+        return SearchScore(
+            score=score,
+            quality="high" if score >= 0.7 else "medium" if score >= 0.4 else "low",
+            feedback=feedback or _EMPTY,
+            issues=issues or _EMPTY
+        )
     
-    def _refine_query(self, original_query: str, feedback: list[str], iteration: int) -> str:
+    def _refine_query(self, original_query: str, feedback: Sequence[str], iteration: int) -> str:
         """
         Refine query based on scoring feedback.
         
@@ -415,6 +706,104 @@ Return ONLY valid JSON with this exact structure (no markdown code blocks):
         
         return refined
     
+    async def _create_extraction_session(self, ticker: str, year: int, quarter: int) -> str:
+        """
+        Create an empty extraction session unique to this run.
+        
+        Concurrent runs for the same company period (e.g. the root agent's prefetch
+        and a direct tool call) each get their own session, so neither can wipe the
+        other's history mid-run. Callers delete it with _delete_extraction_session.
+        
+        Args:
+            ticker: Company ticker symbol (or joined tickers for a batch)
+            year: Target year
+            quarter: Target quarter
+        
+        Returns:
+            Session id ready for a fresh extraction run
+        """
+        session_id = f"metrics_{ticker}_{year}_Q{quarter}_{next(self._session_counter)}"
+        await self.session_service.create_session(
+            app_name=APP_NAME,
+            user_id="system",
+            session_id=session_id
+        )
+        return session_id
+    
+    async def _delete_extraction_session(self, session_id: str) -> None:
+        """Drop a finished extraction session so the in-memory store does not grow per run."""
+        try:
+            await self.session_service.delete_session(
+                app_name=APP_NAME,
+                user_id="system",
+                session_id=session_id
+            )
+        except Exception as e:
+            logger.debug("  Could not delete session %s: %s", session_id, e)
+    
+    async def _run_search(self, ticker: str, year: int, quarter: int, iteration: int, query: str) -> str:
+        """
+        Execute a single search through the ADK runner (Vertex AI Search grounding).
+        
+        Returns:
+            Text of the first final response, or an empty string
+        """
+        # Create session for this search
+        search_session_id = f"search_{ticker}_{year}_Q{quarter}_iter{iteration}_{next(self._session_counter)}"
+        search_session = await self.session_service.create_session(
+            app_name=APP_NAME,
+            user_id="system",
+            session_id=search_session_id
+        )
+        
+        # Use runner to search with current query
+        content = _make_search_content(query)
+        
+        result_text = ""
+        await vertex_limiter().acquire()
+        events = self.runner.run_async(
+            user_id="system",
+            session_id=search_session_id,
+            new_message=content
+        )
+        try:
+            async for event in events:
+                if event.is_final_response():
+                    if event.content and event.content.parts:
+                        text_parts = [text for part in event.content.parts if (text := getattr(part, 'text', None))]
+                        if text_parts:
+                            result_text = ''.join(text_parts)
+                            break
+        finally:
+            # Close the generator now rather than at GC so the session and
+            # underlying stream are released as soon as we stop reading
+            await events.aclose()
+        
+        return result_text
+    
+    async def _search_with_backoff(self, ticker: str, year: int, quarter: int, iteration: int, query: str) -> str:
+        """
+        Run a search, retrying the same query on transient API errors.
+        
+        Quota, deadline, and 5xx errors are retried with exponential backoff and
+        jitter instead of consuming the next refinement iteration.
+        
+        Raises:
+            The last transient error once MAX_TRANSIENT_RETRIES is exhausted
+        """
+        for attempt in range(self.MAX_TRANSIENT_RETRIES + 1):
+            try:
+                return await self._run_search(ticker, year, quarter, iteration, query)
+            except _TRANSIENT_ERRORS as e:
+                if attempt == self.MAX_TRANSIENT_RETRIES:
+                    raise
+                delay = min(2 ** attempt + random.random(), 30)
+                logger.info(
+                    "    ⏳ %s on iteration %d, retrying in %.1fs (attempt %d/%d)",
+                    type(e).__name__, iteration, delay, attempt + 1, self.MAX_TRANSIENT_RETRIES
+                )
+                await asyncio.sleep(delay)
+    
     async def _iterative_search(self, ticker: str, year: int, quarter: int) -> tuple[str, float]:
         """
         Perform iterative search with reflection and query refinement.
@@ -447,72 +836,110 @@ Return ONLY valid JSON with this exact structure (no markdown code blocks):
                     iteration
                 )
             
-            print(f"  🔍 Iteration {iteration}/{self.MAX_QUERY_ITERATIONS}: {current_query[:80]}...")
+            logger.info("  🔍 Iteration %d/%d: %s...", iteration, self.MAX_QUERY_ITERATIONS, current_query[:80])
             
             # Execute search through agent (ADK will use Vertex AI Search)
             try:
-                # Create session for this search
-                import time
-                search_session_id = f"search_{ticker}_{year}_Q{quarter}_iter{iteration}_{int(time.time()*1000)}"
-                search_session = await self.session_service.create_session(
-                    app_name=APP_NAME,
-                    user_id="system",
-                    session_id=search_session_id
-                )
-                
-                # Use runner to search with current query
-                search_prompt = f"""Search for: {current_query}
-                
-Return the first 2000 characters of the most relevant search results.
-Focus on finding segment financial tables and metrics from 10-Q filings."""
-                
-                content = types.Content(
-                    role='user',
-                    parts=[types.Part(text=search_prompt)]
-                )
-                
-                result_text = ""
-                async for event in self.runner.run_async(
-                    user_id="system",
-                    session_id=search_session_id,
-                    new_message=content
-                ):
-                    if event.is_final_response():
-                        if event.content and event.content.parts:
-                            text_parts = [part.text for part in event.content.parts if hasattr(part, 'text') and part.text]
-                            if text_parts:
-                                result_text = ''.join(text_parts)
-                                break
+                result_text = await self._search_with_backoff(ticker, year, quarter, iteration, current_query)
                 
                 # Score the results
                 scoring = self._score_search_results(result_text, ticker, year, quarter)
-                current_score = scoring["score"]
+                current_score = scoring.score
                 
-                print(f"    📊 Quality: {scoring['quality']} (score: {current_score:.2f})")
+                logger.info("    📊 Quality: %s (score: %.2f)", scoring.quality, current_score)
                 
                 # Track best results
                 if current_score > best_score:
                     best_score = current_score
                     best_results = result_text
                     best_query = current_query
-                    previous_feedback = scoring["feedback"]
+                    previous_feedback = scoring.feedback
                 
                 # Stop if quality threshold met
                 if current_score >= self.MIN_QUALITY_SCORE:
-                    print(f"    ✅ Quality threshold met ({current_score:.2f} >= {self.MIN_QUALITY_SCORE})")
+                    logger.info("    ✅ Quality threshold met (%.2f >= %s)", current_score, self.MIN_QUALITY_SCORE)
                     break
                 
                 # Log issues for refinement
-                if scoring["issues"]:
-                    print(f"    ⚠️  Issues: {', '.join(scoring['issues'][:2])}")
+                if scoring.issues and logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("    ⚠️  Issues: %s", ', '.join(scoring.issues[:2]))
                 
             except Exception as e:
-                print(f"    ❌ Search iteration {iteration} failed: {e}")
+                logger.info("    ❌ Search iteration %d failed: %s", iteration, e)
                 continue
         
-        print(f"  🎯 Final quality score: {best_score:.2f} after {iteration} iteration(s)")
+        logger.info("  🎯 Final quality score: %.2f after %d iteration(s)", best_score, iteration)
         return best_results, best_score
 
+    async def _wait_before_retry(self, ticker: str, attempt: int) -> bool:
+        """
+        Sleep with jittered exponential backoff if another extraction attempt remains.
+        
+        Args:
+            ticker: Company ticker symbol (for logging)
+            attempt: Zero-based index of the attempt that just failed
+        
+        Returns:
+            True if the caller should retry, False if attempts are exhausted
+        """
+        if attempt >= self.MAX_EXTRACTION_RETRIES:
+            return False
+        delay = 2 ** attempt + random.random()
+        logger.info("  ↻ Retrying %s extraction in %.1fs (attempt %d/%d)...",
+                    ticker, delay, attempt + 2, self.MAX_EXTRACTION_RETRIES + 1)
+        await asyncio.sleep(delay)
+        return True
+    
+    async def _repair_response(self, session_id: str, result_text: str) -> Optional[Dict]:
+        """
+        Ask the agent to reformat a response whose JSON did not match the expected schema.
+        
+        Runs one follow-up turn in the extraction session, so the agent can reuse
+        the search results already in its context rather than searching again.
+        
+        Args:
+            session_id: Extraction session that produced the response
+            result_text: The malformed response text
+        
+        Returns:
+            Parsed metrics dictionary, or None if the repaired response is still unusable
+        """
+        content = types.Content(
+            role='user',
+            parts=[types.Part(text=_REPAIR_PROMPT_TEMPLATE.format(response=result_text[:4000]))]
+        )
+        
+        repaired_text = ""
+        try:
+            await vertex_limiter().acquire()
+            async with asyncio.timeout(self.FIRST_EVENT_TIMEOUT):
+                events = self.runner.run_async(
+                    user_id="system",
+                    session_id=session_id,
+                    new_message=content
+                )
+                try:
+                    async for event in events:
+                        if event.is_final_response() and event.content and event.content.parts:
+                            text_parts = [text for part in event.content.parts if (text := getattr(part, 'text', None))]
+                            if text_parts:
+                                repaired_text = ''.join(text_parts)
+                                break
+                finally:
+                    await events.aclose()
+        except asyncio.TimeoutError:
+            return None
+        
+        start = repaired_text.find('{')
+        end = _json_object_end(repaired_text, start) if start != -1 else -1
+        if end == -1:
+            return None
+        try:
+            repaired = await _parse_json(repaired_text[start:end])
+        except json.JSONDecodeError:
+            return None
+        return repaired if _has_metrics_shape(repaired) else None
+    
     async def _extract_company_metrics_async(self, ticker: str, year: int, quarter: int) -> Dict:
         """
         Extract COMMERCIAL SEGMENT financial metrics for a single company (async).
@@ -525,236 +952,315 @@ Focus on finding segment financial tables and metrics from 10-Q filings."""
         Returns:
             Dictionary with commercial segment metrics
         """
-        print(f"\n💰 Extracting COMMERCIAL metrics for {ticker} Q{quarter} {year}...")
-        
-        # Company-specific search guidance
-        segment_guidance = {
-            "TRV": "Search TRV 10-Q Item 2 MD&A  for section titled 'Business Insurance' and subsection 'Results of Business Insurance'. Look for the results table with columns for 'Three Months Ended September 30' showing current year and prior year. Key line items under Revenues: Earned premiums, Net investment income, Fee income, Other revenues, Total revenues. Then find: Total claims and expenses, Segment income before income taxes, Segment income. At the bottom of the table find the ratios: Loss and loss adjustment expense ratio, Underwriting expense ratio, Combined ratio. Catastrophe losses are mentioned in the Overview narrative text that follows the table (e.g., 'Catastrophe losses in the third quarters of 2025 and 2024 were $139 million and $340 million').",
-            "HIG": "Search HIG 10-Q Item 2 MD&A for section titled 'Reportable Segment And Corporate Operating Summaries' with subsection 'Business Insurance - Results of Operations'. CRITICAL: Find the 'Underwriting Ratios' table at the bottom of the section. This table shows columns for 'Three Months Ended September 30' (current and prior year). Extract the Combined Ratio, Loss and loss adjustment expense ratio, and Expense ratio directly from this Underwriting Ratios table - DO NOT calculate or use ratios from other tables. For Q3 2025, use the 2025 column value. Also find the 'Underwriting Summary' table above it for: Written premiums, Net earned premiums, Current accident year catastrophes (for cat losses), Underwriting gain/loss (for underwriting income). The Underwriting Ratios table is the authoritative source for all ratios.",
-            "AIG": "Search AIG 10-Q Item 2 MD&A   for section titled 'NORTH AMERICA COMMERCIAL RESULTS' under 'Business Segment Operations' and 'General Insurance'. Look for the 'Underwriting results' table with columns for 'Three Months Ended September 30' showing current year and prior year. Key line items: Net premiums written, Increase in unearned premiums, Net premiums earned, Losses and loss adjustment expenses incurred, Policy acquisition costs, Other acquisition expenses, General operating expenses, Underwriting income. Find ratios: Loss ratio, Acquisition ratio, General operating expense ratio, Expense ratio, Combined ratio. Below the main table find 'Adjustments for accident year loss ratio, as adjusted and accident year combined ratio, as adjusted' showing Catastrophic losses and Prior year development. Also look for 'CAV combined ratio' line (combined ratio excluding catastrophe losses).",
-            "CB": "Search CB 10-Q Item 2 MD&A  for section titled 'North America Commercial P&C Insurance'. Look for the results table with columns for 'Three Months Ended September 30' showing current year and prior year. Key line items: Net premiums written, Net premiums earned, Losses and loss expenses, Policy acquisition costs, Administrative expenses, Underwriting income, Segment income. At the bottom find ratios: Combined ratio, Loss and loss expense ratio, Policy acquisition cost ratio, Administrative expense ratio, Combined ratio (CAV combined ratio excluding catastrophe losses). Below the main table, find 'Net Catastrophe Losses and Prior Period Development' table showing 'Net catastrophe losses' and 'Favorable prior period development'. Also find 'Production by Size - Net premiums written' table showing Major Accounts & Specialty vs Commercial breakdown.",
-            "CNA": "Search CNA 10-Q Item 2 MD&A   for section titled 'Commercial'. Look for table with header 'Periods ended September 30' with columns for 'Three Months' and 'Nine Months' showing current year (2025) and prior year (2024). Key line items: Gross written premiums, Net written premiums, Net earned premiums, Underwriting gain (loss), Net investment income, Core income. Below the main table find 'Other performance metrics' section showing: Loss ratio, Expense ratio, Dividend ratio, Combined ratio. Then find adjustments section showing: 'Less: Effect of catastrophe impacts', 'Less: Effect of (favorable) unfavorable development-related items', 'Underlying combined ratio', 'Underlying loss ratio'. Also find 'Rate' section showing Renewal premium change and Retention. The 'Three Month Comparison' narrative describes drivers of combined ratio changes.",
-            "WRB": "Search for 'Insurance' segment in the Business Segments Note (Note 22). W.R. Berkley reports commercial business under the 'Insurance' segment. Use Insurance segment revenues (earned premiums), expenses (losses and loss expenses), and pre-tax income as commercial metrics. The segment table shows Insurance and Reinsurance & Monoline Excess columns - use the Insurance column.",
-            "BRK.B": "Search BRK.B 10-Q for Note 24 'Business segment data' showing the underwriting activities table. This table has COLUMNS for: GEICO, BH Primary, BHRG, Total Underwriting, Investment Income, and Total. Extract data from the 'BH Primary' COLUMN only (NOT GEICO or BHRG). Key rows: Revenues, Losses and loss adjustment expenses ('LAE'), Life annuity and health benefits, Other segment items, Total costs and expenses, and Earnings before income taxes. The BH Primary column shows Berkshire Hathaway Primary Group commercial insurance operations. Calculate Combined Ratio = (Losses and LAE + Other segment items) / Revenues × 100. Use 'Earnings before income taxes' from BH Primary column as underwriting income."
-        }
+        # Identical prompt already answered in this process: skip the agent run entirely
+        cache_key = _result_cache_key(ticker, year, quarter)
+        if (cached := self._results_cache.get(cache_key)) is not None:
+            logger.info("\n💰 Using cached COMMERCIAL metrics for %s Q%d %d", ticker, quarter, year)
+            return cached
         
-        search_hint = segment_guidance.get(ticker, f"Search for commercial insurance segment data for {ticker}")
+        logger.info("\n💰 Extracting COMMERCIAL metrics for %s Q%d %d...", ticker, quarter, year)
         
-        # Map quarter to period end date and filing month for search
-        quarter_end_dates = {
-            1: "March 31",
-            2: "June 30", 
-            3: "September 30",
-            4: "December 31"
-        }
-        filing_months = {
-            1: ("April", "May"),
-            2: ("July", "August"),
-            3: ("October", "November"),
-            4: ("February", "March")
+        # Simplified, focused extraction prompt - 10-Q ONLY (memoized per company period)
+        content = _make_extraction_content(ticker, year, quarter)
+        
+        for attempt in range(self.MAX_EXTRACTION_RETRIES + 1):
+            session_id = None
+            try:
+                session_id = await self._create_extraction_session(ticker, year, quarter)
+                
+                # Run and get final response with timeout
+                result_text = ""
+                final_response_count = 0
+                # Events are kept only for the debug summary below; the normal path keeps none
+                debug_events = [] if logger.isEnabledFor(logging.DEBUG) else None
+                waiting_for_first_event = True
+                try:
+                    await vertex_limiter().acquire()
+                    # Short deadline until the agent responds at all, then the overall cap
+                    async with asyncio.timeout(self.FIRST_EVENT_TIMEOUT) as deadline:
+                        events = self.runner.run_async(
+                            user_id="system",
+                            session_id=session_id,
+                            new_message=content
+                        )
+                        try:
+                            async for event in events:
+                                if waiting_for_first_event:
+                                    waiting_for_first_event = False
+                                    deadline.reschedule(asyncio.get_running_loop().time() + self.EXTRACTION_TIMEOUT)
+                                
+                                if debug_events is not None:
+                                    debug_events.append(event)
+                                
+                                if not event.is_final_response():
+                                    continue
+                                
+                                final_response_count += 1
+                                if event.content and event.content.parts:
+                                    # Extract text from all text parts (may also have function_call parts)
+                                    text_parts = [text for part in event.content.parts if (text := getattr(part, 'text', None))]
+                                    if text_parts:
+                                        # Got text response - update result_text
+                                        result_text = ''.join(text_parts)
+                                        # Stop as soon as a complete JSON object has arrived
+                                        brace_idx = result_text.find('{')
+                                        if brace_idx != -1 and _json_object_end(result_text, brace_idx) != -1:
+                                            break
+                        finally:
+                            # Release the runner's generator instead of waiting for GC
+                            await events.aclose()
+                except asyncio.TimeoutError:
+                    limit = self.FIRST_EVENT_TIMEOUT if waiting_for_first_event else self.EXTRACTION_TIMEOUT
+                    logger.info("  ✗ Timeout after %d seconds for %s", limit, ticker)
+                    if await self._wait_before_retry(ticker, attempt):
+                        continue
+                    return _error_result(ticker, year, quarter, f"Agent timeout after {limit} seconds")
+                
+                # Debug logging for event processing
+                if debug_events is not None:
+                    function_call_count = sum(
+                        1
+                        for event in debug_events if event.content and event.content.parts
+                        for part in event.content.parts if getattr(part, 'function_call', None)
+                    )
+                    logger.debug(
+                        "  📊 Events: %d total, %d final, %d function calls",
+                        len(debug_events), final_response_count, function_call_count
+                    )
+                
+                if not result_text:
+                    if final_response_count == 0:
+                        logger.info("  ✗ Empty response: No final response events received")
+                    else:
+                        logger.info("  ✗ Empty response: %d final response(s) but no text extracted", final_response_count)
+                    return _error_result(ticker, year, quarter, "Empty response from agent")
+                
+                # Parse JSON response
+                json_text = result_text.strip()
+                
+                # Fast path: the prompt asks for a bare JSON object, which is the common case.
+                # Only fall back to fence stripping and brace matching when it is wrapped.
+                if not (json_text.startswith('{') and json_text.endswith('}')):
+                    # Remove markdown code blocks if present
+                    if "```json" in json_text:
+                        json_text = json_text.split("```json")[1].split("```")[0].strip()
+                    elif "```" in json_text:
+                        json_text = json_text.split("```")[1].split("```")[0].strip()
+                    
+                    # If response starts with explanatory text, find the JSON object
+                    if not json_text.startswith('{'):
+                        # Look for first { and take everything from there
+                        brace_idx = json_text.find('{')
+                        if brace_idx != -1:
+                            json_text = json_text[brace_idx:]
+                        else:
+                            logger.info("  ✗ No JSON object found in response")
+                            logger.info("  Response preview (first 500 chars): %s", result_text[:500])
+                            return _error_result(
+                                ticker, year, quarter, "No JSON object found in response",
+                                raw_response_preview=result_text[:1000]
+                            )
+                    
+                    # Drop any trailing commentary after the matching closing brace
+                    object_end = _json_object_end(json_text, 0)
+                    if object_end != -1:
+                        json_text = json_text[:object_end]
+                
+                # Try to parse JSON with better error handling
+                try:
+                    metrics_data = await _parse_json(json_text)
+                except json.JSONDecodeError as je:
+                    logger.info("  ✗ JSON parse error: %s", je)
+                    logger.info("  Response preview (first 500 chars): %s", result_text[:500])
+                    if await self._wait_before_retry(ticker, attempt):
+                        continue
+                    return _error_result(
+                        ticker, year, quarter, f"JSON parse error: {str(je)}",
+                        raw_response_preview=result_text[:1000]
+                    )
+                
+                # Valid JSON with the wrong shape: ask for a reformat in the same session
+                # instead of repeating the whole retrieval
+                if not _has_metrics_shape(metrics_data):
+                    logger.info("  ✗ Response JSON missing 'commercial_metrics' object, requesting repair")
+                    metrics_data = await self._repair_response(session_id, result_text)
+                    if metrics_data is None:
+                        return _error_result(
+                            ticker, year, quarter, "Response did not match the expected schema",
+                            raw_response_preview=result_text[:1000]
+                        )
+                
+                logger.info("  ✓ Extracted %d Commercial metrics", len(metrics_data['commercial_metrics']))
+                
+                self._results_cache[cache_key] = metrics_data
+                return metrics_data
+            
+            except Exception as e:
+                # Include the traceback only at DEBUG level
+                logger.info("  ✗ Error extracting metrics: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+                return _error_result(ticker, year, quarter, str(e))
+            
+            finally:
+                # Each attempt (including the repair turn) runs in its own session
+                if session_id is not None:
+                    await self._delete_extraction_session(session_id)
+    
+    async def _extract_batch_async(self, tickers: List[str], year: int, quarter: int) -> Dict[str, Dict]:
+        """
+        Extract COMMERCIAL SEGMENT metrics for several companies in one agent run.
+        
+        The system instruction and tool schema are sent once for the whole batch
+        instead of once per company. The agent returns a JSON object keyed by
+        ticker. Any ticker missing from the batch response, or whose entry lacks
+        the metrics structure, falls back to _extract_company_metrics_async, as do
+        all tickers when the batch run itself fails. The batch and its fallback
+        share one REQUEST_TIMEOUT budget: a batch that times out gets error
+        results instead of a fallback, and fallback runs still pending when the
+        budget runs out are cancelled.
+        
+        Args:
+            tickers: Company ticker symbols to extract together
+            year: Target year
+            quarter: Target quarter
+        
+        Returns:
+            Dictionary mapping ticker to commercial metrics
+        """
+        # Serve previously extracted companies from the result cache
+        results: Dict[str, Dict] = {
+            ticker: hit for ticker in tickers
+            if (hit := self._results_cache.get(_result_cache_key(ticker, year, quarter))) is not None
         }
-        period_end = quarter_end_dates.get(quarter, f"Q{quarter}")
-        months = filing_months.get(quarter, ("",))
+        tickers = [ticker for ticker in tickers if ticker not in results]
+        if not tickers:
+            return results
         
-        # Simplified, focused extraction prompt - 10-Q ONLY
-        prompt = f"""Extract commercial segment metrics for {ticker} from 10-Q for THREE MONTHS ENDED {period_end}, {year}.
-
-**SEARCH STRATEGY (try these queries with year and quarter):**
-1. "{ticker} {year} Q{quarter} commercial segment business insurance"
-2. "{ticker} {year} Q{quarter} underwriting results combined ratio"
-3. "{ticker} {year} Q{quarter} net written premiums earned premiums"
-4. "{ticker} {year} Q{quarter} segment information financial results"
+        logger.info("\n💰 Extracting COMMERCIAL metrics for %s Q%d %d (batched)...", ", ".join(tickers), quarter, year)
+        
+        period_end = _QUARTER_END_DATES.get(quarter, f"Q{quarter}")
+        company_sections = "\n\n".join(
+            f"## Company {i}: {ticker}\n"
+            f"{_SEGMENT_GUIDANCE.get(ticker, f'Search for commercial insurance segment data for {ticker}')}"
+            for i, ticker in enumerate(tickers, 1)
+        )
+        
+        prompt = f"""Extract commercial segment metrics from 10-Q filings for THREE MONTHS ENDED {period_end}, {year} for EACH company below.
 
-**WHERE TO FIND DATA:**
-{search_hint}
+Search separately for each company using queries like "<TICKER> {year} Q{quarter} commercial segment combined ratio".
 
-**EXTRACT 8 METRICS:**
-1. Net Written Premiums ($M) - from segment table (absolute dollar amount)
-2. Net Written Premiums Growth (%) - compare to prior year quarter
-3. Combined Ratio (%) - from segment results or MD&A
-4. Loss Ratio (%) - if separately disclosed
-5. Expense Ratio (%) - if separately disclosed
-6. Underwriting Income ($M) - segment income before tax
-7. Catastrophe Losses ($M) - if disclosed for commercial
-8. Net Earned Premiums ($M) - from segment table (for revenue context)
+{company_sections}
 
-**IMPORTANT:**
-- Make MULTIPLE searches - each metric may be in different sections
-- The 10-Q filing EXISTS in the datastore for Q{quarter} {year}
-- Look in: Segment tables (Notes), MD&A section
-- If not found immediately, try different search terms
-- Combined ratio often in MD&A "Results of [Segment Name]"
-- Net Written Premiums and Net Earned Premiums are DOLLAR AMOUNTS in millions
+**EXTRACT 8 METRICS PER COMPANY:**
+Net Written Premiums ($M), Net Written Premiums Growth (%), Combined Ratio (%), Loss Ratio (%),
+Expense Ratio (%), Underwriting Income ($M), Catastrophe Losses ($M), Net Earned Premiums ($M)
 
-**RETURN JSON:**
+**RETURN A JSON OBJECT keyed by ticker, with one entry per company listed:**
 {{
-  "ticker": "{ticker}",
-  "year": {year},
-  "quarter": {quarter},
-  "commercial_metrics": {{
-    "Net Written Premiums": {{"value": 5400, "citation": "[Source: {ticker} 10-Q Q{quarter} {year}, Note 3]"}},
-    "Net Written Premiums Growth": {{"value": 8.5, "citation": "[Source: {ticker} 10-Q Q{quarter} {year}, MD&A]"}},
-    "Combined Ratio": {{"value": 94.5, "citation": "[Source: ...]"}},
-    "Loss Ratio": {{"value": 62.3, "citation": "[Source: ...]"}},
-    "Expense Ratio": {{"value": 32.2, "citation": "[Source: ...]"}},
-    "Underwriting Income": {{"value": 450, "citation": "[Source: ...]"}},
-    "Catastrophe Losses": {{"value": 125, "citation": "[Source: ...]"}},
-    "Net Earned Premiums": {{"value": 5100, "citation": "[Source: ...]"}}
-  }}
+  "TICKER": {{
+    "ticker": "TICKER",
+    "year": {year},
+    "quarter": {quarter},
+    "commercial_metrics": {{
+      "Combined Ratio": {{"value": 94.5, "citation": "[Source: TICKER 10-Q Q{quarter} {year}, MD&A]"}},
+      ...
+    }}
+  }},
+  ...
 }}
 
 **CRITICAL OUTPUT REQUIREMENTS:**
-- Return ONLY the JSON object above
-- DO NOT include any conversational text
-- DO NOT ask questions
-- DO NOT say the filing doesn't exist - it does
-- If you cannot find data after searching, use null: {{"value": null, "citation": "Not Disclosed in 10-Q"}}
-- Start response with {{ and end with }}
+- Return ONLY the JSON object - start with {{ and end with }}
+- If a metric cannot be found, use null: {{"value": null, "citation": "Not Disclosed in 10-Q"}}
 - No markdown, no code blocks, no explanations - JUST JSON"""
         
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + REQUEST_TIMEOUT
+        batch_timed_out = False
+        session_id = None
         try:
-            # Create session with timestamp for uniqueness
-            import time
-            session_id = f"metrics_{ticker}_{year}_Q{quarter}_{int(time.time()*1000)}"
-            session = await self.session_service.create_session(
-                app_name=APP_NAME,
-                user_id="system",
-                session_id=session_id
-            )
+            session_id = await self._create_extraction_session("_".join(tickers), year, quarter)
             
-            # Prepare message
             content = types.Content(
                 role='user',
                 parts=[types.Part(text=prompt)]
             )
             
-            # Run and get final response with timeout
             result_text = ""
-            event_count = 0
-            final_response_count = 0
-            function_call_count = 0
-            try:
-                async with asyncio.timeout(600):  # 10 minute timeout for complex searches
-                    async for event in self.runner.run_async(
-                        user_id="system",
-                        session_id=session_id,
-                        new_message=content
-                    ):
-                        event_count += 1
-                        
-                        # Log event details for debugging
-                        if hasattr(event, 'content') and event.content:
-                            if event.content.parts:
-                                for part in event.content.parts:
-                                    if hasattr(part, 'function_call'):
-                                        function_call_count += 1
-                        
-                        if event.is_final_response():
-                            final_response_count += 1
-                            if event.content and event.content.parts:
-                                # Extract text from all text parts (may also have function_call parts)
-                                text_parts = [part.text for part in event.content.parts if hasattr(part, 'text') and part.text]
-                                if text_parts:
-                                    # Got text response - update result_text
-                                    result_text = ''.join(text_parts)
-                                else:
-                                    # Final response exists but has no text parts (likely function call)
-                                    # Continue processing - agent may make function calls before final text response
-                                    part_types = [type(part).__name__ for part in event.content.parts]
-                                    # Don't print warning - this is normal for function calls
-                            else:
-                                # No content or parts - unusual but continue processing
-                                pass
-            except asyncio.TimeoutError:
-                print(f"  ✗ Timeout after 600 seconds for {ticker}")
-                return {
-                    "ticker": ticker,
-                    "year": year,
-                    "quarter": quarter,
-                    "commercial_metrics": {},
-                    "status": "error",
-                    "error": "Agent timeout after 600 seconds"
-                }
-            
-            # Debug logging for event processing
-            print(f"  📊 Events: {event_count} total, {final_response_count} final, {function_call_count} function calls")
-            
-            if not result_text:
-                if final_response_count == 0:
-                    print(f"  ✗ Empty response: No final response events received")
-                else:
-                    print(f"  ✗ Empty response: {final_response_count} final response(s) but no text extracted")
-                return {
-                    "ticker": ticker,
-                    "year": year,
-                    "quarter": quarter,
-                    "commercial_metrics": {},
-                    "status": "error",
-                    "error": "Empty response from agent"
-                }
-            
-            # Parse JSON response
-            json_text = result_text.strip()
-            
-            # Remove markdown code blocks if present
-            if "```json" in json_text:
-                json_text = json_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in json_text:
-                json_text = json_text.split("```")[1].split("```")[0].strip()
-            
-            # If response starts with explanatory text, find the JSON object
-            if not json_text.startswith('{'):
-                # Look for first { and take everything from there
-                brace_idx = json_text.find('{')
-                if brace_idx != -1:
-                    json_text = json_text[brace_idx:]
-                    # Find matching closing brace
-                    # Simple approach: take to end, let JSON parser validate
-                else:
-                    print(f"  ✗ No JSON object found in response")
-                    print(f"  Response preview (first 500 chars): {result_text[:500]}")
-                    return {
-                        "ticker": ticker,
-                        "year": year,
-                        "quarter": quarter,
-                        "commercial_metrics": {},
-                        "status": "error",
-                        "error": "No JSON object found in response",
-                        "raw_response_preview": result_text[:1000]
-                    }
-            
-            # Try to parse JSON with better error handling
-            try:
-                metrics_data = json.loads(json_text)
-            except json.JSONDecodeError as je:
-                print(f"  ✗ JSON parse error: {je}")
-                print(f"  Response preview (first 500 chars): {result_text[:500]}")
-                return {
-                    "ticker": ticker,
-                    "year": year,
-                    "quarter": quarter,
-                    "commercial_metrics": {},
-                    "status": "error",
-                    "error": f"JSON parse error: {str(je)}",
-                    "raw_response_preview": result_text[:1000]
-                }
-            
-            print(f"  ✓ Extracted {len(metrics_data.get('commercial_metrics', {}))} Commercial metrics")
+            await vertex_limiter().acquire()
+            async with asyncio.timeout_at(deadline):
+                events = self.runner.run_async(
+                    user_id="system",
+                    session_id=session_id,
+                    new_message=content
+                )
+                try:
+                    async for event in events:
+                        if event.is_final_response() and event.content and event.content.parts:
+                            text_parts = [text for part in event.content.parts if (text := getattr(part, 'text', None))]
+                            if text_parts:
+                                result_text = ''.join(text_parts)
+                                break
+                finally:
+                    await events.aclose()
             
-            return metrics_data
+            start = result_text.find('{')
+            end = _json_object_end(result_text, start) if start != -1 else -1
+            if end != -1:
+                batch_data = await _parse_json(result_text[start:end])
+                if not isinstance(batch_data, dict):
+                    batch_data = {}
+                    logger.info("  ✗ Batch response is not a JSON object keyed by ticker")
+                for ticker in tickers:
+                    entry = batch_data.get(ticker)
+                    # Entries without the metrics structure go to the single-ticker fallback
+                    if isinstance(entry, dict) and _has_metrics_shape(entry):
+                        entry.setdefault("ticker", ticker)
+                        entry.setdefault("year", year)
+                        entry.setdefault("quarter", quarter)
+                        results[ticker] = entry
+                        self._results_cache[_result_cache_key(ticker, year, quarter)] = entry
+            else:
+                logger.info("  ✗ No JSON object found in batch response")
+        
+        except asyncio.TimeoutError:
+            # The whole budget is spent; a fallback would only double the group's wall time
+            batch_timed_out = True
+            logger.info("  ✗ Batch extraction timed out after %ss, skipping per-company fallback", REQUEST_TIMEOUT)
         
         except Exception as e:
-            print(f"  ✗ Error extracting metrics: {e}")
-            import traceback
-            traceback.print_exc()
-            return {
-                "ticker": ticker,
-                "year": year,
-                "quarter": quarter,
-                "commercial_metrics": {},
-                "status": "error",
-                "error": str(e)
+            # Any other batch failure is recoverable: every company still gets its own extraction
+            logger.info("  ✗ Batch extraction failed (%s: %s), falling back to per-company extraction", type(e).__name__, e)
+        
+        finally:
+            if session_id is not None:
+                await self._delete_extraction_session(session_id)
+        
+        # Fall back to the single-ticker path for anything the batch did not return,
+        # within whatever is left of the group's time budget
+        missing = [ticker for ticker in tickers if ticker not in results]
+        if missing and batch_timed_out:
+            for ticker in missing:
+                results[ticker] = _error_result(ticker, year, quarter, f"Batch extraction timed out after {REQUEST_TIMEOUT}s")
+        elif missing:
+            fallback = {
+                ticker: asyncio.create_task(self._extract_company_metrics_async(ticker, year, quarter))
+                for ticker in missing
             }
+            _, pending = await asyncio.wait(fallback.values(), timeout=max(deadline - loop.time(), 0))
+            for task in pending:
+                task.cancel()
+            # Let cancelled runs finish their cleanup (session deletion) before returning
+            await asyncio.gather(*pending, return_exceptions=True)
+            for ticker, task in fallback.items():
+                if task in pending:
+                    results[ticker] = _error_result(ticker, year, quarter, f"Extraction timed out after {REQUEST_TIMEOUT}s")
+                elif task.exception() is not None:
+                    results[ticker] = _error_result(ticker, year, quarter, f"Exception during extraction: {task.exception()}")
+                else:
+                    results[ticker] = task.result()
+        
+        logger.info("  ✓ Batch complete: %d/%d from batched response", len(tickers) - len(missing), len(tickers))
+        return results
     
     def extract_company_metrics(self, ticker: str, year: int, quarter: int) -> Dict:
         """
@@ -768,86 +1274,80 @@ Focus on finding segment financial tables and metrics from 10-Q filings."""
         Returns:
             Dictionary with commercial segment metrics
         """
-        return asyncio.run(self._extract_company_metrics_async(ticker, year, quarter))
+        return self._run_sync(self._extract_company_metrics_async(ticker, year, quarter))
     
-    async def extract_all_companies_async(self, year: int, quarter: int, max_concurrent: int = 2) -> Dict[str, Dict]:
+    async def extract_all_companies_async(self, year: int, quarter: int, max_concurrent: int = MAX_CONCURRENT_EXTRACTIONS) -> Dict[str, Dict]:
         """
-        Extract COMMERCIAL SEGMENT metrics for all companies (async version with batched parallel processing).
+        Extract COMMERCIAL SEGMENT metrics for all companies (async version with paced parallel processing).
         
-        Uses asyncio.gather() in batches to analyze companies concurrently while avoiding API rate limits.
-        Default batch size of 2 concurrent requests for maximum API stability.
+        Companies are grouped EXTRACTION_BATCH_SIZE at a time into a single agent run
+        (see _extract_batch_async) and all groups are started as tasks up front. A
+        semaphore bounds how many runs are in flight and the shared vertex_limiter
+        (acquired inside each run) spaces their starts. Progress is reported with
+        asyncio.as_completed() as each group finishes.
         
         Args:
             year: Target year
             quarter: Target quarter
-            max_concurrent: Maximum number of concurrent company extractions (default: 2)
+            max_concurrent: Maximum number of concurrent extraction runs (default: MAX_CONCURRENT_EXTRACTIONS)
         
         Returns:
             Dictionary mapping ticker to commercial metrics
         """
-        print(f"\n" + "="*80)
-        print(f"EXTRACTING COMMERCIAL SEGMENT METRICS - Q{quarter} {year} (BATCHED PARALLEL MODE)")
-        print("="*80)
-        print(f"  🚀 Processing {len(COMPANIES)} companies in batches of {max_concurrent}...")
-        
-        all_metrics = {}
-        
-        # Process companies in batches to avoid overwhelming the API
-        for i in range(0, len(COMPANIES), max_concurrent):
-            batch = COMPANIES[i:i+max_concurrent]
-            batch_num = (i // max_concurrent) + 1
-            total_batches = (len(COMPANIES) + max_concurrent - 1) // max_concurrent
-            
-            print(f"\n  📦 Batch {batch_num}/{total_batches}: {[c['ticker'] for c in batch]}")
-            
-            # Create tasks for current batch
-            tasks = [
-                self._extract_company_metrics_async(company["ticker"], year, quarter)
-                for company in batch
-            ]
-            
-            # Execute batch in parallel with error handling
-            try:
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-            except Exception as batch_error:
-                print(f"    ✗ Batch execution failed: {batch_error}")
-                # Mark all companies in this batch as errored
-                for company in batch:
-                    all_metrics[company["ticker"]] = {
-                        "ticker": company["ticker"],
-                        "status": "error",
-                        "error": f"Batch execution failed: {str(batch_error)}"
-                    }
-                continue
-            
-            # Map results back to tickers
-            for company, result in zip(batch, results):
-                ticker = company["ticker"]
-                if isinstance(result, Exception):
-                    print(f"    ⚠️  {ticker}: Exception - {type(result).__name__}: {result}")
-                    all_metrics[ticker] = {
-                        "ticker": ticker,
-                        "status": "error",
-                        "error": f"Exception during extraction: {str(result)}"
-                    }
-                elif result.get("status") == "error":
+        logger.info("\n" + "="*80)
+        logger.info("EXTRACTING COMMERCIAL SEGMENT METRICS - Q%d %d (PACED PARALLEL MODE)", quarter, year)
+        logger.info("="*80)
+        logger.info(
+            "  🚀 Processing %d companies in groups of %d, up to %d at a time...",
+            len(COMPANIES), EXTRACTION_BATCH_SIZE, max_concurrent
+        )
+        
+        tickers = [company["ticker"] for company in COMPANIES]
+        groups = [tickers[i:i + EXTRACTION_BATCH_SIZE] for i in range(0, len(tickers), EXTRACTION_BATCH_SIZE)]
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        async def extract(group: List[str]) -> tuple:
+            async with semaphore:
+                try:
+                    return group, await self._extract_batch_async(group, year, quarter)
+                except Exception as e:
+                    return group, e
+        
+        tasks = [asyncio.create_task(extract(group)) for group in groups]
+        
+        results = {}
+        status_lines = {}
+        
+        # One progress line per finished group; per-company detail goes in the final summary
+        for groups_done, next_done in enumerate(asyncio.as_completed(tasks), 1):
+            group, group_result = await next_done
+            for ticker in group:
+                if isinstance(group_result, Exception):
+                    status_lines[ticker] = f"    ⚠️  {ticker}: Exception - {type(group_result).__name__}: {group_result}"
+                    results[ticker] = _error_result(
+                        ticker, year, quarter, f"Exception during extraction: {str(group_result)}"
+                    )
+                    continue
+                
+                result = results[ticker] = group_result.get(ticker, {})
+                if result.get("status") == "error":
                     # Agent returned error structure
-                    all_metrics[ticker] = result
                     error_msg = result.get("error", "Unknown error")
-                    print(f"    ✗ {ticker}: {error_msg[:80]}")
+                    status_lines[ticker] = f"    ✗ {ticker}: {error_msg[:80]}"
                 else:
                     # Successful extraction
-                    all_metrics[ticker] = result
                     metric_count = len(result.get("commercial_metrics", {}))
-                    print(f"    ✓ {ticker}: Extracted {metric_count} metrics")
-            
-            # Longer pause between batches to respect API rate limits
-            if i + max_concurrent < len(COMPANIES):
-                print(f"    ⏳ Waiting 3 seconds before next batch...")
-                await asyncio.sleep(3)
+                    status_lines[ticker] = f"    ✓ {ticker}: Extracted {metric_count} metrics"
+            logger.info("    📦 %d/%d groups complete", groups_done, len(groups))
+        
+        # Keep the configured company order regardless of completion order
+        all_metrics = {ticker: results[ticker] for ticker in tickers}
         
         successful = sum(1 for m in all_metrics.values() if m.get("status") != "error")
-        print(f"\n✓ Completed batched extraction: {successful}/{len(all_metrics)} companies successful")
+        logger.info(
+            "%s\n\n✓ Completed parallel extraction: %d/%d companies successful",
+            "\n".join(status_lines[ticker] for ticker in tickers), successful, len(all_metrics)
+        )
         
         return all_metrics
     
@@ -862,5 +1362,5 @@ Focus on finding segment financial tables and metrics from 10-Q filings."""
         Returns:
             Dictionary mapping ticker to commercial metrics
         """
-        return asyncio.run(self.extract_all_companies_async(year, quarter))
+        return self._run_sync(self.extract_all_companies_async(year, quarter))
 
@@ -0,0 +1,54 @@
+"""
+Non-blocking Logging Configuration
+
+Routes agent log records through a QueueHandler so that formatting and
+stdout writes happen on a background QueueListener thread instead of
+inside the asyncio event loop.
+
+Call setup_queue_logging from an entrypoint (script, notebook); library code
+never configures handlers, so applications and pytest's caplog see agent
+records through normal propagation.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import threading
+
+_listener = None
+_lock = threading.Lock()
+
+
+def setup_queue_logging(level: int = logging.INFO) -> None:
+    """
+    Attach a QueueHandler to the agents package logger (idempotent).
+
+    Log calls from async code only enqueue the record; a single background
+    thread owned by the QueueListener performs the blocking write to stdout.
+    Nothing is attached when logging is already configured (a handler on the
+    package logger or any ancestor), and records keep propagating either way.
+
+    Args:
+        level: Minimum level emitted by the agents package logger
+    """
+    global _listener
+
+    with _lock:
+        package_logger = logging.getLogger(__package__)
+        if _listener is not None or package_logger.hasHandlers():
+            return
+
+        log_queue = queue.Queue(-1)
+
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+        package_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        package_logger.setLevel(level)
+
+        _listener = logging.handlers.QueueListener(
+            log_queue, stream_handler, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(_listener.stop)
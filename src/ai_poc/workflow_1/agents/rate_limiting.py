@@ -0,0 +1,52 @@
+"""
+Shared Request Pacing
+
+Paces agent run starts so parallel fan-outs across the root and specialized
+agents stay under Vertex AI quota instead of tripping 429 retries.
+"""
+
+import asyncio
+import threading
+from functools import lru_cache
+
+from .config import VERTEX_REQUESTS_PER_SECOND
+
+
+class RateLimiter:
+    """Leaky-bucket pacer that spaces request starts at a fixed rate."""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate
+        self._next_start = 0.0
+        # Agents also run on worker threads with their own event loops
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.total_wait = 0.0
+
+    async def acquire(self) -> None:
+        """Reserve the next start slot and sleep until it arrives."""
+        # loop.time() is monotonic, so slots are comparable across event loops
+        now = asyncio.get_running_loop().time()
+        with self._lock:
+            start = max(now, self._next_start)
+            # Reserve before awaiting so concurrent callers get distinct slots
+            self._next_start = start + self._interval
+            self.acquired += 1
+            self.total_wait += start - now
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def stats(self) -> dict:
+        """Return the number of acquisitions and the total/average time spent waiting."""
+        with self._lock:
+            return {
+                "acquired": self.acquired,
+                "total_wait_seconds": round(self.total_wait, 3),
+                "avg_wait_seconds": round(self.total_wait / self.acquired, 3) if self.acquired else 0.0,
+            }
+
+
+@lru_cache(maxsize=1)
+def vertex_limiter() -> RateLimiter:
+    """Return the process-wide limiter shared by every agent's runner calls."""
+    return RateLimiter(VERTEX_REQUESTS_PER_SECOND)
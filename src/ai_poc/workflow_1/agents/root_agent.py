@@ -13,27 +13,18 @@ Observability:
 """
 
 from google.adk.agents import Agent
-from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
+from google.api_core.exceptions import DeadlineExceeded, ResourceExhausted, ServiceUnavailable
 from google.genai import types
-from typing import Optional, Dict
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 import json
 from datetime import datetime
+from functools import lru_cache
+import itertools
 import os
-import time
+import threading
 import asyncio
 
-# Initialize Arize AX tracing if credentials are available
-try:
-    from ..arize_tracing.arize_config import setup_arize_tracing
-    _arize_initialized = False
-    if os.getenv("ARIZE_SPACE_ID") and os.getenv("ARIZE_API_KEY"):
-        setup_arize_tracing()
-        _arize_initialized = True
-except ImportError:
-    _arize_initialized = False
-    pass  # Tracing is optional
-
 from .config import (
     DEFAULT_MODEL,
     TEMPERATURE,
@@ -49,9 +40,25 @@ from .config import (
     GENERATION_CONFIG,
     REQUEST_TIMEOUT
 )
+from .rate_limiting import vertex_limiter
+from .sessions import shared_session_service
 from .tools import (
-    FindLatestQuarterTool,
-    ValidateDataTool,
+    FinancialMetricsTool,
+    CompetitivePositioningTool,
+    StrategicInitiativesTool,
+    RiskOutlookTool,
+    find_latest_quarter,
+    validate_data_availability,
+    extract_financial_metrics,
+    analyze_competitive_positioning,
+    identify_strategic_initiatives,
+    assess_risk_outlook
+)
+
+
+# Analysis tools attached to the root agent. Quarter discovery and data validation
+# run in Python before the agent is invoked, so the model never needs those tools
+_ROOT_TOOLS = (
     FinancialMetricsTool,
     CompetitivePositioningTool,
     StrategicInitiativesTool,
@@ -59,36 +66,109 @@ from .tools import (
 )
 
 
-class CompetitiveIntelligenceRootAgent:
+# Transient failures worth retrying; anything else fails the report immediately
+_RETRYABLE_ERRORS = (
+    asyncio.TimeoutError,
+    ConnectionError,
+    ResourceExhausted,
+    DeadlineExceeded,
+    ServiceUnavailable,
+)
+
+
+# Suffixes that keep default session IDs unique when reports start in the same second
+_session_ids = itertools.count()
+
+_arize_initialized = False
+_arize_init_lock = threading.Lock()
+
+
+def _ensure_arize_tracing() -> bool:
     """
-    Root ADK agent that orchestrates competitive intelligence analysis.
+    Initialize Arize AX tracing once per process if credentials are available.
     
-    This agent uses Google ADK's Agent with specialized tools to:
-    1. Determine the target quarter (auto-detect or specified)
-    2. Validate data availability
-    3. Coordinate analysis across 5 dimensions:
-       - Financial Metrics
-       - Competitive Positioning
-       - Strategic Initiatives
-       - Risk & Outlook
-    4. Synthesize findings into comprehensive report
-    5. Generate executive summary focused on The Hartford
+    Called from CompetitiveIntelligenceRootAgent.__init__ rather than at import, so
+    importing this module never blocks on credential reads.
+    
+    Returns:
+        True if tracing is enabled
     """
+    global _arize_initialized
     
-    def __init__(self):
-        """Initialize the root ADK agent with all tools and grounding."""
-        
-        # Build Vertex AI Search datastore path
-        self.datastore_path = (
-            f"projects/{GCP_PROJECT_ID}/locations/{GCP_LOCATION}/"
-            f"collections/default_collection/dataStores/{DATA_STORE_ID}"
-        )
-        
-        # System instruction for the root agent
-        self.system_instruction = """
-You are the Competitive Intelligence Orchestrator for The Hartford Financial Services Group.
+    with _arize_init_lock:
+        if _arize_initialized:
+            return True
+        if not (os.getenv("ARIZE_SPACE_ID") and os.getenv("ARIZE_API_KEY")):
+            return False
+        try:
+            from ..arize_tracing.arize_config import setup_arize_tracing
+        except ImportError:
+            return False  # Tracing is optional
+        setup_arize_tracing()
+        _arize_initialized = True
+        return True
+
+
+def _write_text(path: str, text: str, mode: str = 'w') -> None:
+    """Write (or append) text to a file; run via asyncio.to_thread from async code."""
+    with open(path, mode, encoding='utf-8') as f:
+        f.write(text)
+
+
+async def _stream_to_file(queue: asyncio.Queue, path: str) -> None:
+    """Write text chunks from the queue to a fresh file until a None sentinel arrives."""
+    f = await asyncio.to_thread(open, path, 'w', encoding='utf-8')
+    try:
+        done = False
+        while not done:
+            # Batch everything queued since the last write into one thread hop
+            chunks = [await queue.get()]
+            while not queue.empty():
+                chunks.append(queue.get_nowait())
+            if None in chunks:
+                chunks = chunks[:chunks.index(None)]
+                done = True
+            if chunks:
+                await asyncio.to_thread(_append_and_flush, f, ''.join(chunks))
+    finally:
+        await asyncio.to_thread(f.close)
+
+
+async def _pump_events(events: AsyncIterator, queue: asyncio.Queue) -> None:
+    """
+    Feed agent events into the queue under REQUEST_TIMEOUT.
+    
+    The queue ends with None on success, or with the exception that stopped the run.
+    """
+    try:
+        async with asyncio.timeout(REQUEST_TIMEOUT):
+            async for event in events:
+                queue.put_nowait(event)
+    except Exception as e:
+        queue.put_nowait(e)
+    else:
+        queue.put_nowait(None)
+    finally:
+        await events.aclose()
 
-Your mission is to generate comprehensive quarterly competitive intelligence reports 
+
+def _append_and_flush(f, text: str) -> None:
+    """Write text to an open file and flush it so partial output is visible on disk."""
+    f.write(text)
+    f.flush()
+
+
+def _save_report(filepath: str, content: str, partial_path: str) -> None:
+    """Write the finished report and remove the streamed partial output it supersedes."""
+    _write_text(filepath, content)
+    if os.path.exists(partial_path):
+        os.remove(partial_path)
+
+
+# Static system instruction for the root agent (built once per process)
+_ROOT_SYSTEM_INSTRUCTION = """You are the Competitive Intelligence Orchestrator for The Hartford Financial Services Group.
+
+Your mission is to generate comprehensive quarterly competitive intelligence reports
 analyzing The Hartford (HIG) and its 6 major competitors in the COMMERCIAL INSURANCE segment:
 - Travelers (TRV)
 - Chubb (CB)
@@ -111,10 +191,17 @@ EXCLUDE:
 - Retirement/Asset Management
 - Other non-commercial segments
 
+PRE-FETCHED DATA:
+The request message names the target quarter and includes PRE-FETCHED ANALYSIS DATA blocks:
+data_availability plus one block per analysis tool. Data has been pre-fetched; do not
+re-invoke tools unless an analysis block reports an error. In that case call only the
+analysis tool that produced it. If the analysis blocks are absent because no company has
+complete data, report the missing filings instead of analyzing.
+
 WORKFLOW:
-1. Determine target quarter (use find_latest_quarter if not specified)
-2. Validate data availability for all companies
-3. Execute analyses in this order:
+1. Use the target quarter given in the request
+2. Review data_availability for gaps to flag in the report
+3. Execute analyses in this order (from the pre-fetched blocks):
    a. Extract financial metrics for COMMERCIAL SEGMENT ONLY
    b. Analyze competitive positioning in COMMERCIAL LINES
    c. Identify strategic initiatives affecting COMMERCIAL business
@@ -152,14 +239,14 @@ Generate a comprehensive markdown report with:
 
 **IMPORTANT SCOPE NOTICE** (include at top of report):
 ```
-> **Analysis Scope Note**: This competitive intelligence report analyzes publicly traded 
-> US-domiciled commercial insurance companies only. The following major commercial insurers 
+> **Analysis Scope Note**: This competitive intelligence report analyzes publicly traded
+> US-domiciled commercial insurance companies only. The following major commercial insurers
 > were excluded from this POC analysis:
 > - **Liberty Mutual** (private company - not publicly traded)
 > - **Zurich Insurance Group** (non-US company - domiciled in Switzerland)
 > - **Tokio Marine Holdings** (non-US company - domiciled in Japan)
-> 
-> Analysis focuses on the 7 major public US commercial insurers with available SEC filings 
+>
+> Analysis focuses on the 7 major public US commercial insurers with available SEC filings
 > and earnings call transcripts.
 ```
 
@@ -174,7 +261,7 @@ Report Sections:
     - Underwriting Income (Commercial)
     - Catastrophe Losses (Commercial)
     - Prior Year Development (Commercial)
-  * **CRITICAL DATA SOURCE PRIORITY FOR THIS TABLE ONLY**: 
+  * **CRITICAL DATA SOURCE PRIORITY FOR THIS TABLE ONLY**:
     - PRIMARY SOURCE: Form 10-Q/10-K SEC filings (use segment tables in Notes section)
     - FALLBACK ONLY: Earnings call transcripts (only if metric not disclosed in 10-Q/10-K)
     - For TRV: Use "Business Insurance" segment from Note 2 SEGMENT INFORMATION in 10-Q
@@ -205,65 +292,159 @@ Report Sections:
 
 **DATA SOURCES:**
 You have access to:
-1. **Vertex AI Search Datastore** (PRIMARY): SEC filings (10-K, 10-Q) and earnings call transcripts 
+1. **Vertex AI Search Datastore** (PRIMARY): SEC filings (10-K, 10-Q) and earnings call transcripts
    for all 7 companies via FunctionTools. This is the authoritative source for financial data.
 2. **Your analysis tools**: Use the provided FunctionTools to retrieve and analyze data.
 3. When citing, reference specific documents: [Company 10-K Q3 2025], [Company Earnings Call Q2 2025]
 
-Always use the FunctionTools to retrieve company-specific data. The tools will access the 
-uploaded datastore and provide comprehensive citations.
-"""
+Always use the FunctionTools to retrieve company-specific data. The tools will access the
+uploaded datastore and provide comprehensive citations."""
+
+
+@lru_cache(maxsize=1)
+def _get_root_runtime(system_instruction: str, tools: tuple = _ROOT_TOOLS) -> tuple:
+    """
+    Build the root (agent, session_service, runner) triple once per instruction and tool set.
+    
+    Args:
+        system_instruction: System instruction for the root agent
+        tools: Tools attached to the agent
+    
+    Returns:
+        Tuple of (Agent, BaseSessionService, Runner)
+    """
+    # Create the ADK Agent with tools and grounding configuration
+    agent = Agent(
+        name=ROOT_AGENT_NAME,
+        model=DEFAULT_MODEL,
+        description=ROOT_AGENT_DESCRIPTION,
+        instruction=system_instruction,
+        tools=list(tools),
+        generate_content_config={
+            "temperature": TEMPERATURE,
+            "max_output_tokens": 8192,
+        }
+    )
+    
+    # Runner on the process-wide session service
+    session_service = shared_session_service()
+    runner = Runner(
+        agent=agent,
+        app_name=APP_NAME,
+        session_service=session_service
+    )
+    return agent, session_service, runner
+
+
+class CompetitiveIntelligenceRootAgent:
+    """
+    Root ADK agent that orchestrates competitive intelligence analysis.
+    
+    This agent uses Google ADK's Agent with specialized tools to:
+    1. Determine the target quarter (auto-detect or specified)
+    2. Validate data availability
+    3. Coordinate analysis across 5 dimensions:
+       - Financial Metrics
+       - Competitive Positioning
+       - Strategic Initiatives
+       - Risk & Outlook
+    4. Synthesize findings into comprehensive report
+    5. Generate executive summary focused on The Hartford
+    
+    Async-first: await generate_report from async code (servers, notebooks);
+    generate_report_sync is a convenience wrapper for synchronous scripts.
+    """
+    
+    def __init__(self):
+        """Initialize the root ADK agent with all tools and grounding."""
         
-        # Create the ADK Agent with tools and grounding configuration
-        tools = [
-            FindLatestQuarterTool,
-            ValidateDataTool,
-            FinancialMetricsTool,
-            CompetitivePositioningTool,
-            StrategicInitiativesTool,
-            RiskOutlookTool
-        ]
-        
-        self.agent = Agent(
-            name=ROOT_AGENT_NAME,
-            model=DEFAULT_MODEL,
-            description=ROOT_AGENT_DESCRIPTION,
-            instruction=self.system_instruction,
-            tools=tools,
-            generate_content_config={
-                "temperature": TEMPERATURE,
-                "max_output_tokens": 8192,
-            }
-        )
+        tracing_enabled = _ensure_arize_tracing()
         
-        # Create session service and runner
-        self.session_service = InMemorySessionService()
-        self.runner = Runner(
-            agent=self.agent,
-            app_name=APP_NAME,
-            session_service=self.session_service
+        # Build Vertex AI Search datastore path
+        self.datastore_path = (
+            f"projects/{GCP_PROJECT_ID}/locations/{GCP_LOCATION}/"
+            f"collections/default_collection/dataStores/{DATA_STORE_ID}"
         )
         
+        # System instruction for the root agent
+        self.system_instruction = _ROOT_SYSTEM_INSTRUCTION
+        
+        # Agent, session service and runner are shared by every instance in the process
+        self.agent, self.session_service, self.runner = _get_root_runtime(self.system_instruction)
+        # Event loop shared by the synchronous wrapper; created on first sync call
+        self._loop_runner: Optional[asyncio.Runner] = None
+        
         print(f"[OK] {ROOT_AGENT_NAME} initialized with ADK")
         print(f"  Model: {DEFAULT_MODEL}")
-        print(f"  Tools: {len(tools)} specialized analysis tools")
+        print(f"  Tools: {len(_ROOT_TOOLS)} specialized analysis tools")
         print(f"  Data Source: Vertex AI Search via FunctionTools ({DATA_STORE_ID})")
         print(f"  Citations: Provided by specialized agents")
-        if _arize_initialized:
+        if tracing_enabled:
             print(f"  Observability: Arize AX tracing enabled ✓")
             print(f"  View traces at: https://app.arize.com")
         else:
             print(f"  Observability: Not configured (set ARIZE_SPACE_ID and ARIZE_API_KEY to enable)")
     
-    async def generate_report(
+    async def _prefetch_analyses(self, year: int, quarter: int) -> Dict[str, Dict]:
+        """
+        Validate data availability, then run the analysis tools concurrently.
+        
+        The root agent would otherwise call each tool in its own reason/act turn,
+        one after another. Running them together makes the stage as slow as the
+        slowest analysis, and the agent only performs the final synthesis. When
+        validation finds no company with complete data the analyses are skipped,
+        so a quarter without filings does not pay for the full fan-out.
+        
+        Args:
+            year: Target year
+            quarter: Target quarter
+        
+        Returns:
+            Dictionary mapping each analysis name to its result (or an error structure)
+        """
+        prefetched = {}
+        try:
+            prefetched["data_availability"] = await asyncio.to_thread(validate_data_availability, year, quarter)
+        except Exception as e:
+            print(f"  ⚠️  data_availability: {type(e).__name__}: {e}")
+            prefetched["data_availability"] = {"status": "error", "error": str(e)}
+        
+        if prefetched["data_availability"].get("complete_companies") == 0:
+            print(f"\n⚠️  No company has complete data for Q{quarter} {year}; skipping analyses")
+            return prefetched
+        
+        print(f"\n⚡ Pre-fetching analyses for Q{quarter} {year} in parallel...")
+        
+        analyses = {
+            "financial_metrics": extract_financial_metrics(year, quarter),
+            "competitive_positioning": analyze_competitive_positioning(year, quarter),
+            "strategic_initiatives": identify_strategic_initiatives(year, quarter),
+            "risk_outlook": assess_risk_outlook(year, quarter),
+        }
+        results = await asyncio.gather(*analyses.values(), return_exceptions=True)
+        
+        for name, result in zip(analyses, results):
+            if isinstance(result, Exception):
+                print(f"  ⚠️  {name}: {type(result).__name__}: {result}")
+                prefetched[name] = {"status": "error", "error": str(result)}
+            else:
+                prefetched[name] = result
+        
+        return prefetched
+    
+    async def generate_report_stream(
         self,
         year: Optional[int] = None,
         quarter: Optional[int] = None,
         user_id: str = "analyst_1",
         session_id: Optional[str] = None
-    ) -> Dict:
+    ) -> AsyncIterator[Tuple[str, Any]]:
         """
-        Generate competitive intelligence report using ADK agent.
+        Generate competitive intelligence report using ADK agent, streaming progress.
+        
+        Text is also appended to a ``<session_id>.partial.md`` file next to the
+        report as it arrives, so partial output survives an interrupted run. The
+        partial file is removed once the final report has been written.
         
         Args:
             year: Target year (auto-detects if None)
@@ -271,30 +452,50 @@ uploaded datastore and provide comprehensive citations.
             user_id: User identifier for session
             session_id: Session ID (auto-generated if None)
         
-        Returns:
-            Dictionary with report content and metadata
+        Yields:
+            (kind, payload) tuples:
+            - ("tool_call", tool name) when the agent calls a tool
+            - ("text_delta", text) for each text part the agent produces
+            - ("retry", attempt number) before a restarted attempt's output; text
+              deltas received earlier belong to the failed attempt and should be discarded
+            - ("final", report_data) once, with the report content and metadata
         """
         print("\n" + "="*80)
         print("COMPETITIVE INTELLIGENCE REPORT GENERATION (ADK)")
         print("="*80)
         
-        # Create session
+        # Resolve the target quarter up front so the analyses can be pre-fetched
+        if not (year and quarter):
+            latest = await asyncio.to_thread(find_latest_quarter)
+            year, quarter = latest["year"], latest["quarter"]
+            print(f"\n📅 Latest complete quarter: Q{quarter} {year}")
+        
+        session_service, runner = self.session_service, self.runner
+        
+        # Session ID (each attempt below runs in its own session derived from it)
         if session_id is None:
-            session_id = f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            session_id = f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{next(_session_ids)}"
         
-        session = await self.session_service.create_session(
-            app_name=APP_NAME,
-            user_id=user_id,
-            session_id=session_id
-        )
+        prefetched = await self._prefetch_analyses(year, quarter)
         
-        # Construct user query
-        if year and quarter:
-            user_query = f"Generate a comprehensive competitive intelligence report for Q{quarter} {year}."
-        else:
-            user_query = "Generate a comprehensive competitive intelligence report for the most recent complete quarter."
+        # Construct user query with the pre-fetched data so the agent only has to synthesize
+        user_query = (
+            f"Generate a comprehensive competitive intelligence report for Q{quarter} {year}.\n"
+            f"Quarter already determined: Q{quarter} {year}. Data availability has already been "
+            f"checked (see data_availability below); do not re-run either step."
+        )
+        if len(prefetched) == 1:
+            user_query += (
+                "\nNo company has complete data for this quarter, so the analyses were not run. "
+                "Report which filings and earnings calls are missing instead of analyzing."
+            )
+        blocks = "\n\n".join(
+            f"### {name}\n```json\n{json.dumps(data, indent=2, default=str)}\n```"
+            for name, data in prefetched.items()
+        )
         
         print(f"\n🤖 Invoking ADK agent with query: {user_query}")
+        user_query += f"\n\nPRE-FETCHED ANALYSIS DATA:\n\n{blocks}"
         
         # Prepare user message
         content = types.Content(
@@ -302,49 +503,92 @@ uploaded datastore and provide comprehensive citations.
             parts=[types.Part(text=user_query)]
         )
         
+        # Output paths (the partial file collects streamed text while the agent runs)
+        await asyncio.to_thread(os.makedirs, REPORT_OUTPUT_DIR, exist_ok=True)
+        extension = "html" if REPORT_FORMAT == "html" else "md"
+        stem = f"ci_report_Q{quarter}_{year}" if year and quarter else f"ci_report_{session_id}"
+        filepath = os.path.join(REPORT_OUTPUT_DIR, f"{stem}.{extension}")
+        # The session ID keeps concurrent runs for the same quarter from sharing a partial file
+        partial_path = os.path.join(REPORT_OUTPUT_DIR, f"{stem}.{session_id}.partial.md")
+        
         # Run the agent with retry logic for network timeouts
-        final_response_text = ""
-        tool_calls_made = []
-        grounding_metadata = None
         max_retries = 2
         retry_delay = 5
         
         for attempt in range(max_retries + 1):
+            # Each attempt starts from scratch: announce the retry before any new deltas so
+            # consumers can discard earlier partial output, and run in a fresh session so the
+            # failed attempt's history is not replayed
+            if attempt:
+                yield ("retry", attempt + 1)
+            attempt_session_id = session_id if attempt == 0 else f"{session_id}_retry{attempt}"
+            # Text parts of the latest final response, joined once after the run
+            final_text_parts: list[str] = []
+            tool_calls_made = []
+            grounding_metadata = None
+            
             try:
-                # Add timeout wrapper
-                async def run_with_timeout():
-                    nonlocal final_response_text, tool_calls_made, grounding_metadata
-                    
-                    async for event in self.runner.run_async(
+                await session_service.create_session(
+                    app_name=APP_NAME,
+                    user_id=user_id,
+                    session_id=attempt_session_id
+                )
+                # The agent runs in a producer task under REQUEST_TIMEOUT (covering the full
+                # report) and events are yielded outside that scope, so time the consumer
+                # spends between events does not count and a timeout surfaces as TimeoutError
+                await vertex_limiter().acquire()
+                event_queue: asyncio.Queue = asyncio.Queue()
+                producer_task = asyncio.create_task(_pump_events(
+                    runner.run_async(
                         user_id=user_id,
-                        session_id=session_id,
+                        session_id=attempt_session_id,
                         new_message=content
-                    ):
-                        # Track tool usage
-                        if hasattr(event, 'content') and event.content and event.content.parts:
+                    ),
+                    event_queue
+                ))
+                # A background task drains text into the partial file while the agent
+                # keeps streaming, so disk writes overlap with generation; each attempt
+                # starts a fresh partial file
+                text_queue: asyncio.Queue = asyncio.Queue()
+                writer_task = asyncio.create_task(_stream_to_file(text_queue, partial_path))
+                try:
+                    while (event := await event_queue.get()) is not None:
+                        if isinstance(event, Exception):
+                            raise event
+                        
+                        if event.content and event.content.parts:
                             for part in event.content.parts:
-                                if hasattr(part, 'function_call') and part.function_call:
+                                # Track tool usage
+                                if getattr(part, 'function_call', None):
                                     tool_calls_made.append(part.function_call.name)
+                                    yield ("tool_call", part.function_call.name)
+                                # Stream every text part, not just the final response
+                                elif getattr(part, 'text', None):
+                                    text_queue.put_nowait(part.text)
+                                    yield ("text_delta", part.text)
                         
                         # Capture final response and grounding metadata
                         if event.is_final_response():
                             if event.content and event.content.parts:
                                 # Extract text from all text parts (response may also have function_call parts)
-                                text_parts = [part.text for part in event.content.parts if hasattr(part, 'text') and part.text]
+                                text_parts = [text for part in event.content.parts if (text := getattr(part, 'text', None))]
                                 if text_parts:
                                     # Update with latest text response (may be multiple final responses with function calls)
-                                    final_response_text = ''.join(text_parts)
-                            
+                                    final_text_parts = text_parts
+                        
                             # Extract grounding metadata if available
                             if hasattr(event, 'grounding_metadata'):
                                 grounding_metadata = event.grounding_metadata
                             # Continue processing - don't break, agent may make multiple tool calls
-                
-                # Run with timeout (5 minutes for full report)
-                await asyncio.wait_for(run_with_timeout(), timeout=REQUEST_TIMEOUT)
+                finally:
+                    # Stops the agent if the consumer closed the stream early; no-op once it finished
+                    producer_task.cancel()
+                    await asyncio.gather(producer_task, return_exceptions=True)
+                    text_queue.put_nowait(None)
+                    await writer_task
                 break  # Success - exit retry loop
                 
-            except (asyncio.TimeoutError, ConnectionError, Exception) as e:
+            except _RETRYABLE_ERRORS as e:
                 if attempt < max_retries:
                     print(f"  ⚠️  Attempt {attempt + 1} failed: {type(e).__name__}")
                     print(f"  Retrying in {retry_delay} seconds...")
@@ -353,10 +597,18 @@ uploaded datastore and provide comprehensive citations.
                 else:
                     print(f"  ✗ All attempts failed: {e}")
                     raise Exception(f"Report generation failed after {max_retries + 1} attempts: {e}")
+            except Exception as e:
+                # Auth, schema and programming errors will not succeed on retry
+                print(f"  ✗ Non-retryable error: {type(e).__name__}: {e}")
+                raise
+        
+        final_response_text = ''.join(final_text_parts)
         
         print(f"\n✓ Agent completed analysis")
         print(f"  Tools used: {len(set(tool_calls_made))} unique tools")
         print(f"  Total tool calls: {len(tool_calls_made)}")
+        pacing = vertex_limiter().stats()
+        print(f"  Request pacing: {pacing['acquired']} runs, {pacing['total_wait_seconds']}s spent waiting")
         
         if grounding_metadata:
             print(f"  Grounding: {len(grounding_metadata.grounding_chunks or [])} chunks used")
@@ -370,7 +622,8 @@ uploaded datastore and provide comprehensive citations.
             "quarter": quarter,
             "report_markdown": final_response_text,
             "tool_calls": tool_calls_made,
-            "session_id": session_id,
+            "prefetched_analyses": list(prefetched),
+            "session_id": attempt_session_id,
             "grounding_metadata": {
                 "chunks_used": len(grounding_metadata.grounding_chunks) if grounding_metadata and grounding_metadata.grounding_chunks else 0,
                 "web_searches": len(grounding_metadata.web_search_queries) if grounding_metadata and hasattr(grounding_metadata, 'web_search_queries') and grounding_metadata.web_search_queries else 0
@@ -378,11 +631,6 @@ uploaded datastore and provide comprehensive citations.
         }
         
         # Export to file
-        os.makedirs(REPORT_OUTPUT_DIR, exist_ok=True)
-        extension = "html" if REPORT_FORMAT == "html" else "md"
-        filename = f"ci_report_Q{quarter}_{year}.{extension}" if year and quarter else f"ci_report_{session_id}.{extension}"
-        filepath = os.path.join(REPORT_OUTPUT_DIR, filename)
-        
         # Convert markdown to HTML if needed
         output_content = final_response_text
         if REPORT_FORMAT == "html":
@@ -498,11 +746,38 @@ uploaded datastore and provide comprehensive citations.
                 print("  ⚠️  Warning: 'markdown' package not installed. Saving as plain markdown with .html extension.")
                 print("     Install with: pip install markdown")
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(output_content)
+        # Write off the event loop so concurrent reports are not blocked by disk I/O
+        await asyncio.to_thread(_save_report, filepath, output_content, partial_path)
         
         print(f"\n✓ Report saved to: {filepath}")
         
+        yield ("final", report_data)
+    
+    async def generate_report(
+        self,
+        year: Optional[int] = None,
+        quarter: Optional[int] = None,
+        user_id: str = "analyst_1",
+        session_id: Optional[str] = None
+    ) -> Dict:
+        """
+        Generate competitive intelligence report using ADK agent.
+        
+        Collects generate_report_stream and returns only the final result.
+        
+        Args:
+            year: Target year (auto-detects if None)
+            quarter: Target quarter 1-4 (auto-detects if None)
+            user_id: User identifier for session
+            session_id: Session ID (auto-generated if None)
+        
+        Returns:
+            Dictionary with report content and metadata
+        """
+        report_data = {}
+        async for kind, payload in self.generate_report_stream(year, quarter, user_id, session_id):
+            if kind == "final":
+                report_data = payload
         return report_data
     
     def generate_report_sync(
@@ -515,12 +790,31 @@ uploaded datastore and provide comprehensive citations.
         """
         Synchronous wrapper for generate_report.
         
-        Use this from non-async code (e.g., standard Python scripts).
+        Use this from non-async code (e.g., standard Python scripts). Async callers
+        should await generate_report directly; this wrapper runs it on the agent's
+        persistent event loop and cannot be used inside one.
         """
-        import asyncio
-        return asyncio.run(
+        return self._run_sync(
             self.generate_report(year, quarter, user_id, session_id)
         )
+    
+    def _run_sync(self, coro):
+        """Run a coroutine on this agent's persistent event loop (used by the sync wrapper)."""
+        if self._loop_runner is None:
+            self._loop_runner = asyncio.Runner()
+        return self._loop_runner.run(coro)
+    
+    def close(self) -> None:
+        """Close the event loop used by the synchronous wrapper, if one was created."""
+        if self._loop_runner is not None:
+            self._loop_runner.close()
+            self._loop_runner = None
+    
+    def __enter__(self) -> "CompetitiveIntelligenceRootAgent":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 
 # Convenience function for quick usage
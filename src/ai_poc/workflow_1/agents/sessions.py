@@ -0,0 +1,23 @@
+"""
+Shared Session Service
+
+One ADK session service for the root and specialized agents, so every runner
+in the process reads and writes the same session store. Setting SESSION_DB_URL
+in config swaps in ADK's DatabaseSessionService to persist sessions across runs.
+"""
+
+from functools import lru_cache
+
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+
+from .config import SESSION_DB_URL
+
+
+@lru_cache(maxsize=1)
+def shared_session_service() -> BaseSessionService:
+    """Return the process-wide session service (database-backed when SESSION_DB_URL is set)."""
+    if SESSION_DB_URL:
+        # Imported lazily: the database backend pulls in SQLAlchemy
+        from google.adk.sessions import DatabaseSessionService
+        return DatabaseSessionService(db_url=SESSION_DB_URL)
+    return InMemorySessionService()
@@ -6,15 +6,24 @@ Filters out Personal Lines initiatives.
 """
 
 from typing import Dict, List, Optional
-import json
 import asyncio
+import hashlib
+import itertools
 import os
+import re
+import threading
+from functools import lru_cache
 import vertexai
 from google.adk.agents import Agent
 from google.adk.tools.vertex_ai_search_tool import VertexAiSearchTool
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
 from google.genai import types
+from pydantic import BaseModel, ValidationError
+
+try:
+    import diskcache
+except ImportError:  # Optional: responses are recomputed on every run without it
+    diskcache = None
 
 from .config import (
     DEFAULT_MODEL, 
@@ -24,20 +33,97 @@ from .config import (
     GCP_LOCATION, 
     DATA_STORE_LOCATION,
     DATA_STORE_ID,
-    COMPANIES
+    COMPANIES,
+    MAX_CONCURRENT_INITIATIVE_QUERIES,
+    RESPONSE_CACHE_DIR,
+    RESPONSE_CACHE_TTL
 )
+from .rate_limiting import vertex_limiter
+from .sessions import shared_session_service
 
+# Outermost JSON object in a response, with or without a markdown fence around it
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
 
-class StrategicInitiativesAgent:
-    """
-    Agent responsible for identifying COMMERCIAL INSURANCE strategic initiatives.
-    
-    **COMMERCIAL FOCUS**: Tracks M&A, product innovation, technology, and
-    organizational changes affecting commercial lines only.
-    """
+# Earnings call search focus per company (segment naming differs by carrier)
+_EARNINGS_CALL_FOCUS = {
+    "HIG": "commercial strategy initiatives",
+    "TRV": "business insurance strategy",
+    "CB": "commercial north america strategy",
+    "AIG": "commercial strategy",
+    "CNA": "commercial strategy",
+    "WRB": "insurance segment strategy",
+}
+
+@lru_cache(maxsize=1)
+def _get_response_cache() -> Optional["diskcache.Cache"]:
+    """Open the persistent response cache, or return None when diskcache is not installed."""
+    if diskcache is None:
+        return None
+    return diskcache.Cache(RESPONSE_CACHE_DIR)
+
+
+def _response_cache_key(ticker: str, year: int, quarter: int, prompt: str) -> str:
+    """Key a company period's analysis by its prompt, so prompt edits invalidate it."""
+    return hashlib.blake2b(f"{ticker}|{year}|Q{quarter}|{prompt}".encode()).hexdigest()
+
+
+class InitiativeTopic(BaseModel):
+    """A single strategic topic from a company's earnings call."""
+    topic: str
+    summary: str
+    theme: str
+    citation: str
+
+
+class CompanyInitiatives(BaseModel):
+    """Expected shape of one company's analysis, validated after the agent run."""
+    topics: List[InitiativeTopic]
+
+
+# Per-company initiative prompt, filled with str.format (doubled braces are literal JSON)
+_INITIATIVE_PROMPT_TEMPLATE = """Identify strategic initiatives for {ticker}'s COMMERCIAL INSURANCE segment in Q{quarter} {year}.
+
+**GROUNDING FOCUS:**
+{ticker} {year} Q{quarter} earnings call {search_focus}
+
+**FIND IN EARNINGS CALL:**
+- Strategic priorities (M&A, partnerships, new products)
+- Technology investments (AI, digital platforms)
+- Growth initiatives (new markets, specialty lines)
+- Management commentary on competitive positioning
+
+**ANALYZE:**
+1. Top 3-5 strategic topics from earnings call
+2. Key metrics or targets mentioned
+3. Competitive moves (new products, markets)
+
+Label each topic with a short industry theme (e.g. "AI and digital underwriting", "Specialty lines expansion")
+so themes can be compared across companies.
+
+**RETURN JSON:**
+{{
+  "topics": [
+    {{"topic": "...", "summary": "...", "theme": "...", "citation": "[Source: {ticker} Q{quarter} {year} Earnings Call, <Initiative Topic>]"}}
+  ]
+}}
+
+Return ONLY valid JSON with citations."""
+
+# Suffixes that keep session IDs unique across concurrent runs in this process
+_session_ids = itertools.count()
+
+_vertex_initialized = False
+_vertex_init_lock = threading.Lock()
+
+
+def _ensure_vertex_initialized() -> None:
+    """Configure the environment and call vertexai.init once per process."""
+    global _vertex_initialized
     
-    def __init__(self):
-        """Initialize the strategic initiatives agent with Vertex AI Search grounding."""
+    with _vertex_init_lock:
+        if _vertex_initialized:
+            return
+        
         # Configure environment for Vertex AI
         os.environ["GOOGLE_GENAI_USE_VERTEXAI"] = "TRUE"
         os.environ["GOOGLE_CLOUD_PROJECT"] = GCP_PROJECT_ID
@@ -45,18 +131,33 @@ class StrategicInitiativesAgent:
         
         # Initialize Vertex AI with GCP credentials
         vertexai.init(project=GCP_PROJECT_ID, location=GCP_LOCATION)
-        
-        # Build datastore path for grounding
-        datastore_path = (
-            f"projects/{GCP_PROJECT_ID}/locations/{DATA_STORE_LOCATION}/"
-            f"collections/default_collection/dataStores/{DATA_STORE_ID}"
-        )
-        
-        # Create ADK Agent with Vertex AI Search grounding
-        self.agent = Agent(
-            name="strategic_initiatives_agent",
-            model=DEFAULT_MODEL,
-            instruction="""Identify strategic initiatives affecting COMMERCIAL INSURANCE business.
+        _vertex_initialized = True
+
+
+@lru_cache(maxsize=1)
+def _get_strategic_runtime(project_id: str, data_store_location: str, data_store_id: str) -> tuple:
+    """
+    Build the (agent, session_service, runner) triple once per datastore.
+    
+    Args:
+        project_id: GCP project that owns the datastore
+        data_store_location: Datastore location
+        data_store_id: Datastore ID used for grounding
+    
+    Returns:
+        Tuple of (Agent, BaseSessionService, Runner)
+    """
+    # Build datastore path for grounding
+    datastore_path = (
+        f"projects/{project_id}/locations/{data_store_location}/"
+        f"collections/default_collection/dataStores/{data_store_id}"
+    )
+    
+    # Create ADK Agent with Vertex AI Search grounding
+    agent = Agent(
+        name="strategic_initiatives_agent",
+        model=DEFAULT_MODEL,
+        instruction="""Identify strategic initiatives affecting COMMERCIAL INSURANCE business.
 
 Focus on Commercial Lines / Business Insurance / Commercial P&C only.
 EXCLUDE Personal Lines initiatives.
@@ -86,79 +187,81 @@ Start your response with { and end with }. Do not wrap in markdown code blocks.
 - **Earnings Call Format**: [Source: <Company> Q<Quarter> <Year> Earnings Call, <Initiative Topic>]
   - Example: [Source: TRV Q1 2024 Earnings Call, Digital platform expansion discussion]
 
-Search datastore for SEC filings and earnings call transcripts.""",
-            description="Analyzes COMMERCIAL LINES strategic initiatives from SEC filings and earnings calls",
-            tools=[VertexAiSearchTool(data_store_id=datastore_path)]
-        )
-        
-        # Create session service and runner
-        self.session_service = InMemorySessionService()
-        self.runner = Runner(
-            agent=self.agent,
-            app_name=APP_NAME,
-            session_service=self.session_service
+Responses are grounded on the datastore of SEC filings and earnings call transcripts; retrieval
+happens alongside generation, so answer directly from the grounded content.""",
+        description="Analyzes COMMERCIAL LINES strategic initiatives from SEC filings and earnings calls",
+        # VertexAiSearchTool is a built-in ADK tool: it attaches a Retrieval config to the
+        # request so grounding happens server-side in the same inference pass (no function
+        # call round-trip). ADK rejects tools passed via generate_content_config.
+        # JSON mode (output_schema) cannot be combined with tools on one LlmAgent, so the
+        # response is validated against CompanyInitiatives after the run instead.
+        tools=[VertexAiSearchTool(data_store_id=datastore_path)]
+    )
+    
+    # Runner on the process-wide session service
+    session_service = shared_session_service()
+    runner = Runner(
+        agent=agent,
+        app_name=APP_NAME,
+        session_service=session_service
+    )
+    return agent, session_service, runner
+
+
+class StrategicInitiativesAgent:
+    """
+    Agent responsible for identifying COMMERCIAL INSURANCE strategic initiatives.
+    
+    **COMMERCIAL FOCUS**: Tracks M&A, product innovation, technology, and
+    organizational changes affecting commercial lines only.
+    
+    Async-first: await _analyze_initiatives_async from async code; analyze_initiatives
+    is a convenience wrapper for synchronous scripts.
+    """
+    
+    def __init__(self):
+        """Initialize the strategic initiatives agent with Vertex AI Search grounding."""
+        # Agent, session service and runner are shared by every instance in the process
+        self.agent, self.session_service, self.runner = _get_strategic_runtime(
+            GCP_PROJECT_ID, DATA_STORE_LOCATION, DATA_STORE_ID
         )
+        # Event loop shared by the synchronous wrapper; created on first sync call
+        self._loop_runner: Optional[asyncio.Runner] = None
         
         print(f"[OK] StrategicInitiativesAgent initialized (COMMERCIAL SEGMENT ONLY)")
         print(f"  Model: {DEFAULT_MODEL}")
     
-    async def _analyze_initiatives_async(self, year: int, quarter: int) -> Dict:
+    async def _analyze_one_company(self, ticker: str, year: int, quarter: int) -> Dict:
         """
-        Identify strategic initiatives affecting COMMERCIAL INSURANCE.
+        Identify COMMERCIAL INSURANCE strategic initiatives for a single company.
         
         Args:
+            ticker: Company ticker symbol
             year: Target year
             quarter: Target quarter
         
         Returns:
-            Dictionary with commercial insurance strategic initiatives
+            Dictionary with the company's topics, or an error structure
         """
-        print(f"\n🎯 Identifying COMMERCIAL INSURANCE strategic initiatives Q{quarter} {year}...")
+        search_focus = _EARNINGS_CALL_FOCUS.get(ticker, "commercial strategy")
         
-        # Simplified strategic initiatives prompt
-        prompt = f"""Identify strategic initiatives for COMMERCIAL INSURANCE segment in Q{quarter} {year}.
-
-**SEARCH EARNINGS CALLS FOR:**
-1. HIG {year} Q{quarter} earnings call commercial strategy initiatives
-2. TRV {year} Q{quarter} earnings call business insurance strategy
-3. CB {year} Q{quarter} earnings call commercial north america strategy
-4. AIG {year} Q{quarter} earnings call commercial strategy
-5. CNA {year} Q{quarter} earnings call commercial strategy
-6. WRB {year} Q{quarter} earnings call insurance segment strategy
-
-**FIND IN EARNINGS CALLS:**
-- Strategic priorities (M&A, partnerships, new products)
-- Technology investments (AI, digital platforms)
-- Growth initiatives (new markets, specialty lines)
-- Management commentary on competitive positioning
-
-**ANALYZE FOR EACH COMPANY:**
-1. Top 3-5 strategic topics from earnings call
-2. Key metrics or targets mentioned
-3. Competitive moves (new products, markets)
-
-**RETURN JSON:**
-{{
-  "company_highlights": {{
-    "HIG": {{
-      "topics": [
-        {{"topic": "...", "summary": "...", "citation": "[Source: HIG Q{quarter} {year} Earnings Call]"}}
-      ]
-    }},
-    ... (repeat for all 6 companies with earnings calls)
-  }},
-  "industry_themes": [
-    {{"theme": "...", "companies": ["HIG", "TRV"], "citation": "[Source: ...]"}}
-  ]
-}}
-
-Return ONLY valid JSON with citations."""
+        prompt = _INITIATIVE_PROMPT_TEMPLATE.format(
+            ticker=ticker, year=year, quarter=quarter, search_focus=search_focus
+        )
+        
+        # Reuse a previous run's parsed response for the identical prompt
+        cache = _get_response_cache()
+        cache_key = _response_cache_key(ticker, year, quarter, prompt)
+        if cache is not None:
+            cached = await asyncio.to_thread(cache.get, cache_key)
+            if cached is not None:
+                print(f"  ✓ {ticker}: {len(cached.get('topics', []))} commercial initiatives (cached)")
+                return cached
         
         try:
-            # Create session with timestamp for uniqueness
-            import time
-            session_id = f"strategic_{year}_Q{quarter}_{int(time.time()*1000)}"
-            session = await self.session_service.create_session(
+            # Create session with a process-unique suffix
+            session_id = f"strategic_{ticker}_{year}_Q{quarter}_{next(_session_ids)}"
+            await self.session_service.create_session(
                 app_name=APP_NAME,
                 user_id="system",
                 session_id=session_id
@@ -171,8 +274,10 @@ Return ONLY valid JSON with citations."""
             )
             
             # Run and get final response with timeout
-            result_text = ""
+            # Text parts of the latest final response, joined once after the run
+            final_text_parts: list[str] = []
             try:
+                await vertex_limiter().acquire()
                 async with asyncio.timeout(300):  # 5 minute timeout
                     async for event in self.runner.run_async(
                         user_id="system",
@@ -181,55 +286,141 @@ Return ONLY valid JSON with citations."""
                     ):
                         if event.is_final_response() and event.content and event.content.parts:
                             # Extract text from all text parts (may also have function_call parts)
-                            text_parts = [part.text for part in event.content.parts if hasattr(part, 'text') and part.text]
-                            result_text = ''.join(text_parts)
+                            final_text_parts = [part.text for part in event.content.parts if hasattr(part, 'text') and part.text]
             except asyncio.TimeoutError:
-                print(f"  ✗ Timeout after 300 seconds")
+                print(f"  ✗ {ticker}: Timeout after 300 seconds")
                 return {
                     "status": "error",
                     "error": "Agent timeout after 300 seconds"
                 }
             
+            result_text = ''.join(final_text_parts)
             if not result_text:
-                print(f"  ✗ Empty response from agent")
+                print(f"  ✗ {ticker}: Empty response from agent")
                 return {
                     "status": "error",
                     "error": "Empty response from agent"
                 }
             
-            # Parse JSON - handle multiple formats
-            json_text = result_text
-            if "```json" in result_text:
-                json_text = result_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in result_text:
-                json_text = result_text.split("```")[1].split("```")[0].strip()
-            
-            # Try to parse JSON
+            # Take the outermost object (ignoring any fence or surrounding prose), then
+            # validate and convert in one pass
+            match = _JSON_OBJECT_RE.search(result_text)
+            json_text = match.group(0) if match else result_text
             try:
-                initiatives = json.loads(json_text)
-            except json.JSONDecodeError as je:
-                print(f"  ✗ JSON parse error: {je}")
+                highlights = CompanyInitiatives.model_validate_json(json_text).model_dump()
+            except ValidationError as je:
+                print(f"  ✗ {ticker}: JSON parse error: {je}")
                 print(f"  Response preview (first 500 chars): {result_text[:500]}")
-                # Return a minimal valid structure instead of failing
                 return {
                     "status": "error",
                     "error": f"JSON parse error: {str(je)}",
                     "raw_response_preview": result_text[:1000]
                 }
             
-            print(f"  ✓ Commercial initiatives analysis complete")
+            print(f"  ✓ {ticker}: {len(highlights.get('topics', []))} commercial initiatives")
+            
+            if cache is not None:
+                await asyncio.to_thread(cache.set, cache_key, highlights, expire=RESPONSE_CACHE_TTL)
             
-            return initiatives
+            return highlights
         
         except Exception as e:
-            print(f"  ✗ Error in initiatives analysis: {e}")
-            import traceback
-            traceback.print_exc()
+            print(f"  ✗ {ticker}: Error in initiatives analysis: {e}")
             return {
                 "status": "error",
                 "error": str(e)
             }
     
+    async def _analyze_initiatives_async(self, year: int, quarter: int) -> Dict:
+        """
+        Identify strategic initiatives affecting COMMERCIAL INSURANCE.
+        
+        Each company with earnings calls is analyzed in its own agent run, all
+        fanned out with asyncio.gather() (bounded by a semaphore), so the stage
+        takes as long as the slowest company rather than the sum of all of them.
+        
+        Args:
+            year: Target year
+            quarter: Target quarter
+        
+        Returns:
+            Dictionary with commercial insurance strategic initiatives
+        """
+        print(f"\n🎯 Identifying COMMERCIAL INSURANCE strategic initiatives Q{quarter} {year}...")
+        
+        # Vertex AI is configured on first use, off the event loop
+        if not _vertex_initialized:
+            await asyncio.to_thread(_ensure_vertex_initialized)
+        
+        tickers = [company["ticker"] for company in COMPANIES if company.get("has_earnings_calls")]
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_INITIATIVE_QUERIES)
+        
+        async def analyze(ticker: str) -> Dict:
+            async with semaphore:
+                return await self._analyze_one_company(ticker, year, quarter)
+        
+        results = await asyncio.gather(*(analyze(ticker) for ticker in tickers), return_exceptions=True)
+        
+        company_highlights = {}
+        themes: Dict[str, Dict] = {}
+        for ticker, result in zip(tickers, results):
+            if isinstance(result, Exception):
+                company_highlights[ticker] = {"status": "error", "error": str(result)}
+                continue
+            
+            company_highlights[ticker] = result
+            # Group topics that share a theme label into cross-company industry themes
+            for topic in result.get("topics", []):
+                label = topic.get("theme")
+                if not label:
+                    continue
+                theme = themes.setdefault(label.strip().lower(), {
+                    "theme": label.strip(),
+                    "companies": [],
+                    "citation": topic.get("citation", "")
+                })
+                if ticker not in theme["companies"]:
+                    theme["companies"].append(ticker)
+        
+        successful = sum(1 for h in company_highlights.values() if h.get("status") != "error")
+        if successful == 0:
+            return {
+                "status": "error",
+                "error": "Strategic initiatives analysis failed for all companies",
+                "company_highlights": company_highlights
+            }
+        
+        print(f"  ✓ Commercial initiatives analysis complete ({successful}/{len(tickers)} companies)")
+        
+        return {
+            "company_highlights": company_highlights,
+            # Themes raised by more than one company first
+            "industry_themes": sorted(themes.values(), key=lambda t: len(t["companies"]), reverse=True)
+        }
+    
     def analyze_initiatives(self, year: int, quarter: int) -> Dict:
-        """Synchronous wrapper for analyze_initiatives."""
-        return asyncio.run(self._analyze_initiatives_async(year, quarter))
+        """
+        Synchronous wrapper for _analyze_initiatives_async.
+        
+        Async callers should await _analyze_initiatives_async directly; this wrapper
+        runs it on the agent's persistent event loop and cannot be used inside one.
+        """
+        return self._run_sync(self._analyze_initiatives_async(year, quarter))
+    
+    def _run_sync(self, coro):
+        """Run a coroutine on this agent's persistent event loop (used by the sync wrapper)."""
+        if self._loop_runner is None:
+            self._loop_runner = asyncio.Runner()
+        return self._loop_runner.run(coro)
+    
+    def close(self) -> None:
+        """Close the event loop used by the synchronous wrapper, if one was created."""
+        if self._loop_runner is not None:
+            self._loop_runner.close()
+            self._loop_runner = None
+    
+    def __enter__(self) -> "StrategicInitiativesAgent":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
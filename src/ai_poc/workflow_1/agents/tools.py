@@ -14,19 +14,12 @@ Observability:
 
 from typing import Any, Dict, Tuple
 import json
-import os
 from datetime import datetime
+from functools import lru_cache
 from google.adk.tools.function_tool import FunctionTool
 from google.cloud import discoveryengine_v1 as discoveryengine
 
-# Initialize Arize AX tracing if credentials are available
-try:
-    from ..arize_tracing.arize_config import setup_arize_tracing
-    if os.getenv("ARIZE_SPACE_ID") and os.getenv("ARIZE_API_KEY"):
-        _tracer = setup_arize_tracing()
-except ImportError:
-    _tracer = None
-    pass  # Tracing is optional
+# Arize AX tracing is set up once by the root agent (_ensure_arize_tracing), not at import
 
 # Import config and specialized agents
 from .config import (
@@ -45,8 +38,6 @@ from .risk_outlook_agent import RiskOutlookAgent
 # Utility Functions (formerly in UtilityAgent)
 # =============================================================================
 
-# Initialize Vertex AI Search client for validation queries
-_search_client = discoveryengine.SearchServiceClient()
 _serving_config = (
     f"projects/{GCP_PROJECT_ID}/locations/{DATA_STORE_LOCATION}/"
     f"collections/default_collection/dataStores/{DATA_STORE_ID}/"
@@ -54,6 +45,12 @@ _serving_config = (
 )
 
 
+@lru_cache(maxsize=1)
+def _get_search_client() -> discoveryengine.SearchServiceClient:
+    """Vertex AI Search client for validation queries, created on first use."""
+    return discoveryengine.SearchServiceClient()
+
+
 def _check_documents_exist(query: str, max_results: int = 3) -> bool:
     """
     Simple check if documents exist for a query (used for validation).
@@ -72,7 +69,7 @@ def _check_documents_exist(query: str, max_results: int = 3) -> bool:
     )
     
     try:
-        response = _search_client.search(request)
+        response = _get_search_client().search(request)
         return len(list(response.results)) > 0
     except Exception as e:
         print(f"⚠️  Validation check error: {e}")
@@ -194,10 +191,26 @@ def _find_latest_complete_quarter() -> Tuple[int, int]:
 # Specialized Agents
 # =============================================================================
 
-_financial_agent = FinancialMetricsAgent()
-_competitive_agent = CompetitivePositioningAgent()
-_strategic_agent = StrategicInitiativesAgent()
-_risk_agent = RiskOutlookAgent()
+# Built on first use so importing this module (e.g. via root_agent) constructs nothing
+
+@lru_cache(maxsize=1)
+def _get_financial_agent() -> FinancialMetricsAgent:
+    return FinancialMetricsAgent()
+
+
+@lru_cache(maxsize=1)
+def _get_competitive_agent() -> CompetitivePositioningAgent:
+    return CompetitivePositioningAgent()
+
+
+@lru_cache(maxsize=1)
+def _get_strategic_agent() -> StrategicInitiativesAgent:
+    return StrategicInitiativesAgent()
+
+
+@lru_cache(maxsize=1)
+def _get_risk_agent() -> RiskOutlookAgent:
+    return RiskOutlookAgent()
 
 
 def find_latest_quarter() -> dict[str, Any]:
@@ -324,7 +337,7 @@ async def extract_financial_metrics(year: int, quarter: int) -> dict[str, Any]:
         comparative analysis highlighting leaders/laggards in Commercial Lines.
     """
     print(f"\\n📊 Extracting financial metrics for Q{quarter} {year}...")
-    all_metrics = await _financial_agent.extract_all_companies_async(year, quarter)
+    all_metrics = await _get_financial_agent().extract_all_companies_async(year, quarter)
     
     return {
         "year": year,
@@ -359,7 +372,7 @@ async def analyze_competitive_positioning(year: int, quarter: int) -> dict[str,
         and Hartford's Commercial Lines specific insights.
     """
     print(f"\\n🏆 Analyzing competitive positioning for Q{quarter} {year}...")
-    analysis = await _competitive_agent._analyze_positioning_async(year, quarter, None)
+    analysis = await _get_competitive_agent()._analyze_positioning_async(year, quarter, None)
     
     return {
         "year": year,
@@ -391,7 +404,7 @@ async def identify_strategic_initiatives(year: int, quarter: int) -> dict[str, A
         and most active companies in Commercial Lines innovation.
     """
     print(f"\n🎯 Identifying strategic initiatives for Q{quarter} {year}...")
-    analysis = await _strategic_agent._analyze_initiatives_async(year, quarter)
+    analysis = await _get_strategic_agent()._analyze_initiatives_async(year, quarter)
     
     return {
         "year": year,
@@ -425,7 +438,7 @@ async def assess_risk_outlook(year: int, quarter: int) -> dict[str, Any]:
         industry-wide risk summary.
     """
     print(f"\\n⚠️  Assessing risk and outlook for Q{quarter} {year}...")
-    analysis = await _risk_agent._analyze_risk_outlook_async(year, quarter, None)
+    analysis = await _get_risk_agent()._analyze_risk_outlook_async(year, quarter, None)
     
     return {
         "year": year,
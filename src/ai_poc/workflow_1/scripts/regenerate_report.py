@@ -16,6 +16,7 @@ load_dotenv(dotenv_path=env_path)
 
 # NOW import the agent (after env vars are loaded)
 from src.ai_poc.workflow_1.agents.root_agent import CompetitiveIntelligenceRootAgent
+from src.ai_poc.workflow_1.agents.logging_config import setup_queue_logging
 
 async def main():
     print("=" * 80)
@@ -37,6 +38,9 @@ async def main():
     print("\nAll agents now have Vertex AI authentication configured.")
     print("This report should complete successfully with all sections populated.\n")
     
+    # Agent progress is logged; write it from a background thread, off the event loop
+    setup_queue_logging()
+    
     # Create root agent (will automatically enable Arize if env vars are set)
     root_agent = CompetitiveIntelligenceRootAgent()
     
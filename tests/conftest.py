@@ -8,14 +8,22 @@ This file is automatically loaded by pytest and provides:
 - Custom pytest hooks
 """
 
+import asyncio
 import pytest
+import pytest_asyncio
 import sys
 import os
 import logging
+import time
 import warnings
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import uvloop
+except ImportError:  # Optional: async tests fall back to the default event loop
+    uvloop = None
+
 # Load environment variables from .env file
 try:
     from dotenv import load_dotenv
@@ -29,6 +37,8 @@ try:
 except ImportError:
     print("[WARNING] python-dotenv not installed, environment variables must be set manually")
 
+logger = logging.getLogger(__name__)
+
 # Suppress verbose warnings
 logging.getLogger("google.genai").setLevel(logging.ERROR)
 warnings.filterwarnings("ignore", message=".*non-text parts in the response.*")
@@ -52,6 +62,9 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 # Session-level Fixtures
 # ============================================================================
 
+_BANNER = "=" * 80
+
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_arize_tracing():
     """
@@ -59,17 +72,23 @@ def setup_arize_tracing():
     
     This fixture runs automatically before any tests execute.
     Tracing is enabled if ARIZE_SPACE_ID and ARIZE_API_KEY are set.
+    Session details are logged at INFO (shown with --log-cli-level=INFO).
     
     Returns:
-        dict: {"enabled": bool, "tracer": TracerProvider or None}
+        dict: {"enabled": bool, "tracer": TracerProvider or None,
+               "start_time_str": session start time, or None when not logged}
     """
-    print("\n" + "="*80)
-    print("PYTEST TEST SESSION STARTING")
-    print("="*80)
-    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Python: {sys.version.split()[0]}")
-    print(f"GCP Project: {os.getenv('GOOGLE_CLOUD_PROJECT')}")
-    print(f"GCP Location: {os.getenv('GOOGLE_CLOUD_LOCATION')}")
+    verbose = logger.isEnabledFor(logging.INFO)
+    start_time_str = time.strftime('%Y-%m-%d %H:%M:%S') if verbose else None
+    if verbose:
+        logger.info(
+            "\n%s\nPYTEST TEST SESSION STARTING\n%s\nTime: %s\nPython: %s\nGCP Project: %s\nGCP Location: %s",
+            _BANNER, _BANNER,
+            start_time_str,
+            sys.version.split()[0],
+            os.getenv('GOOGLE_CLOUD_PROJECT'),
+            os.getenv('GOOGLE_CLOUD_LOCATION'),
+        )
     
     # Try to set up Arize tracing
     try:
@@ -79,39 +98,59 @@ def setup_arize_tracing():
         api_key = os.getenv("ARIZE_API_KEY")
         
         if space_id and api_key:
-            print("\n[INFO] Setting up Arize AX tracing...")
+            logger.info("[INFO] Setting up Arize AX tracing...")
             tracer = setup_arize_tracing()
-            print("[OK] Arize AX tracing ENABLED for test session")
-            print("   View traces at: https://app.arize.com")
-            print("   Project: insurance-competitive-intelligence")
+            logger.info("[OK] Arize AX tracing ENABLED for test session")
+            logger.info("   View traces at: https://app.arize.com")
+            logger.info("   Project: insurance-competitive-intelligence")
             result = {"enabled": True, "tracer": tracer}
         else:
-            print("\n[WARNING] Arize AX credentials not set - tracing DISABLED")
-            print("   Set ARIZE_SPACE_ID and ARIZE_API_KEY to enable")
+            logger.info("[WARNING] Arize AX credentials not set - tracing DISABLED")
+            logger.info("   Set ARIZE_SPACE_ID and ARIZE_API_KEY to enable")
             result = {"enabled": False, "tracer": None}
     
     except ImportError as e:
-        print(f"\n[WARNING] Arize tracing not available: {e}")
+        logger.warning("[WARNING] Arize tracing not available: %s", e)
         result = {"enabled": False, "tracer": None}
     
     except Exception as e:
-        print(f"\n[WARNING] Arize tracing setup failed: {e}")
+        logger.warning("[WARNING] Arize tracing setup failed: %s", e)
         result = {"enabled": False, "tracer": None}
     
-    print("="*80 + "\n")
+    result["start_time_str"] = start_time_str
+    logger.info(_BANNER)
     
     # Yield to run tests
     yield result
     
     # Teardown
-    print("\n" + "="*80)
-    print("PYTEST TEST SESSION COMPLETE")
-    print("="*80)
-    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    if result["enabled"]:
-        print("[OK] Traces sent to Arize AX")
-        print("   View at: https://app.arize.com")
-    print("="*80 + "\n")
+    if verbose:
+        logger.info(
+            "\n%s\nPYTEST TEST SESSION COMPLETE\n%s\nStarted: %s",
+            _BANNER, _BANNER,
+            result["start_time_str"],
+        )
+        if result["enabled"]:
+            # End time only matters for locating this session's traces in Arize
+            logger.info("Time: %s", time.strftime('%Y-%m-%d %H:%M:%S'))
+            logger.info("[OK] Traces sent to Arize AX")
+            logger.info("   View at: https://app.arize.com")
+        logger.info(_BANNER)
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """
+    Event loop policy pytest-asyncio uses for every async test and fixture.
+    
+    The async tests are pure I/O fan-out of Vertex AI calls, so they run on
+    uvloop when it is installed. Providing the policy through this fixture
+    keeps it scoped to the test loops instead of changing the global policy
+    at import.
+    """
+    if uvloop is not None:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
 
 
 @pytest.fixture(scope="session")
@@ -133,6 +172,98 @@ def test_config():
     }
 
 
+# ============================================================================
+# Shared Agent Fixtures
+# ============================================================================
+# The tools module builds one instance of each specialized agent (on first use)
+# for the root agent's tools; the fixtures hand out those same instances so every
+# test module (and the root agent) shares one set of clients and channels.
+
+@pytest.fixture(scope="session")
+def financial_agent():
+    """Financial Metrics Agent shared with the root agent's tools."""
+    from ai_poc.workflow_1.agents import tools
+    return tools._get_financial_agent()
+
+
+@pytest.fixture(scope="session")
+def competitive_agent():
+    """Competitive Positioning Agent shared with the root agent's tools."""
+    from ai_poc.workflow_1.agents import tools
+    return tools._get_competitive_agent()
+
+
+@pytest.fixture(scope="session")
+def strategic_agent():
+    """Strategic Initiatives Agent shared with the root agent's tools."""
+    from ai_poc.workflow_1.agents import tools
+    return tools._get_strategic_agent()
+
+
+@pytest.fixture(scope="session")
+def risk_agent():
+    """Risk Outlook Agent shared with the root agent's tools."""
+    from ai_poc.workflow_1.agents import tools
+    return tools._get_risk_agent()
+
+
+@pytest.fixture(scope="session")
+def root_agent():
+    """Root agent for the whole test session."""
+    from ai_poc.workflow_1.agents import CompetitiveIntelligenceRootAgent
+    return CompetitiveIntelligenceRootAgent()
+
+
+@pytest.fixture(scope="session")
+def latest_quarter_info():
+    """Get latest available quarter for testing (shared by every test module)."""
+    from ai_poc.workflow_1.agents.tools import find_latest_quarter
+    result = find_latest_quarter()
+    assert 'year' in result
+    assert 'quarter' in result
+    assert 1 <= result['quarter'] <= 4
+    assert 2023 <= result['year'] <= 2026
+    return result
+
+
+@pytest.fixture(scope="session")
+def reports_dir() -> Path:
+    """Project generated_reports/ directory, created once per session."""
+    path = Path(__file__).parent.parent / "generated_reports"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+@pytest.fixture(scope="session")
+def run_timestamp() -> str:
+    """Timestamp shared by every artifact this test run saves."""
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def generated_report(root_agent, latest_quarter_info, reports_dir, run_timestamp):
+    """
+    Generate the full report once for every report-assertion test.
+    
+    Report generation runs all specialized agents (5-10 minutes), so tests
+    that only inspect the result share this one run. The markdown is saved to
+    generated_reports/ for inspection, written on a worker thread so the disk
+    flush does not stall the session event loop.
+    
+    Returns:
+        dict: Report data from root_agent.generate_report
+    """
+    year = latest_quarter_info['year']
+    quarter = latest_quarter_info['quarter']
+    report_data = await root_agent.generate_report(year=year, quarter=quarter)
+    report = report_data.get("report_markdown", "") if isinstance(report_data, dict) else str(report_data)
+    
+    output_file = reports_dir / f"pytest_full_report_Q{quarter}_{year}_{run_timestamp}.md"
+    await asyncio.to_thread(output_file.write_text, report, encoding="utf-8")
+    print(f"\n📄 Report saved to: {output_file}")
+    return report_data
+
+
 # ============================================================================
 # Pytest Hooks
 # ============================================================================
@@ -149,27 +280,6 @@ def pytest_collection_modifyitems(config, items):
             item.add_marker(pytest.mark.asyncio)
 
 
-def pytest_configure(config):
-    """
-    Configure pytest with custom settings.
-    
-    This runs before test collection.
-    """
-    # Register custom markers
-    config.addinivalue_line(
-        "markers", 
-        "slow: marks tests as slow (deselect with '-m \"not slow\"')"
-    )
-    config.addinivalue_line(
-        "markers", 
-        "integration: marks tests as integration tests"
-    )
-    config.addinivalue_line(
-        "markers", 
-        "tracing: marks tests related to Arize AX tracing"
-    )
-
-
 def pytest_runtest_setup(item):
     """
     Hook called before each test runs.
@@ -0,0 +1,192 @@
+"""
+Slow ADK Integration Tests: Individual Tool Functions
+
+Runs each analysis tool against live Vertex AI for the latest quarter. These
+tests are all marked slow; the agent stack is imported inside the shared
+tool-results fixture, so a -m "not slow" run deselects them without loading it.
+
+Usage:
+    pytest tests/test_adk_integration_slow.py -v
+    pytest tests -m "not slow" -v  # Tests here are deselected
+"""
+
+import pytest
+import pytest_asyncio
+import asyncio
+import re
+import sys
+import os
+
+# Every test here reads the session-scoped all_tool_results fixture; one xdist group
+# keeps them on a single worker under --dist=loadgroup so the tools run once
+pytestmark = pytest.mark.xdist_group("all_tool_results")
+
+# Configure Vertex AI
+os.environ["GOOGLE_CLOUD_PROJECT"] = "project-4b3d3288-7603-4755-899"
+os.environ["GOOGLE_CLOUD_LOCATION"] = "global"
+os.environ["GOOGLE_GENAI_USE_VERTEXAI"] = "TRUE"
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def all_tool_results(latest_quarter_info):
+    """
+    Run the four analysis tools once, concurrently, for the latest quarter.
+    
+    The tool tests only assert on the results, so sharing one gathered run makes
+    the stage take as long as the slowest tool instead of the sum of all four.
+    """
+    from ai_poc.workflow_1.agents.tools import (
+        extract_financial_metrics,
+        analyze_competitive_positioning,
+        identify_strategic_initiatives,
+        assess_risk_outlook
+    )
+    year = latest_quarter_info['year']
+    quarter = latest_quarter_info['quarter']
+    
+    financial, competitive, strategic, risk = await asyncio.gather(
+        extract_financial_metrics(year, quarter),
+        analyze_competitive_positioning(year, quarter),
+        identify_strategic_initiatives(year, quarter),
+        assess_risk_outlook(year, quarter)
+    )
+    return {
+        "financial_metrics": financial,
+        "competitive_positioning": competitive,
+        "strategic_initiatives": strategic,
+        "risk_outlook": risk,
+    }
+
+
+# Keyword patterns for tool-result assertions (compiled once, matched per string)
+_COMMERCIAL_RE = re.compile(r'commercial|business insurance|workers compensation|general liability', re.I)
+_STRATEGIC_RE = re.compile(r'strategic|initiative|digital|expansion|acquisition|transformation', re.I)
+_RISK_RE = re.compile(r'risk|exposure|catastrophe|climate|cyber|liability|reserve', re.I)
+_PERSONAL_LINES_RE = re.compile(r'personal lines|personal insurance|auto insurance|homeowners insurance', re.I)
+
+
+def _string_leaves(value):
+    """Yield every string in a nested tool result, dict keys included."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(key, str):
+                yield key
+            yield from _string_leaves(item)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            yield from _string_leaves(item)
+
+
+def _mentions(result, pattern) -> bool:
+    """Return True if any string in the result matches the pattern."""
+    return any(pattern.search(leaf) for leaf in _string_leaves(result))
+
+
+# ============================================================================
+# TEST CLASS 3: Individual Tool Function Testing
+# ============================================================================
+
+class TestToolFunctions:
+    """
+    Test individual tool functions for correct behavior.
+    Follows ADK pattern of testing intermediate tool responses.
+    """
+    
+    @pytest.mark.slow
+    def test_extract_financial_metrics(self, all_tool_results):
+        """Test financial metrics extraction with LLM execution."""
+        result = all_tool_results["financial_metrics"]
+        
+        # Verify structure
+        assert isinstance(result, dict), "Result must be dict"
+        assert 'year' in result or 'metrics' in result, \
+            "Result must contain year or metrics"
+        
+        # If metrics present, verify structure
+        if 'metrics' in result:
+            assert isinstance(result['metrics'], dict), \
+                "metrics must be dict"
+            
+            # Should have data for multiple companies
+            company_count = len(result['metrics'])
+            assert company_count > 0, \
+                "Should extract metrics for at least one company"
+    
+    
+    @pytest.mark.slow
+    def test_competitive_positioning(self, all_tool_results):
+        """Test competitive positioning analysis."""
+        result = all_tool_results["competitive_positioning"]
+        
+        # Verify result is dict
+        assert isinstance(result, dict), "Result must be dict"
+        
+        # Check for commercial focus
+        has_commercial = _mentions(result, _COMMERCIAL_RE)
+        
+        assert has_commercial, \
+            "Response should focus on commercial insurance"
+    
+    
+    @pytest.mark.slow
+    def test_strategic_initiatives(self, all_tool_results):
+        """Test strategic initiatives tracking."""
+        result = all_tool_results["strategic_initiatives"]
+        
+        assert isinstance(result, dict), "Result must be dict"
+        
+        # Should contain analysis of strategic initiatives
+        has_strategic = _mentions(result, _STRATEGIC_RE)
+        
+        # Don't fail if keywords not found, but warn
+        if not has_strategic:
+            pytest.skip("Strategic keywords not clearly present - may need investigation")
+    
+    
+    @pytest.mark.slow
+    def test_risk_outlook(self, all_tool_results):
+        """Test risk outlook assessment."""
+        result = all_tool_results["risk_outlook"]
+        
+        assert isinstance(result, dict), "Result must be dict"
+        
+        # Should contain risk analysis
+        has_risk = _mentions(result, _RISK_RE)
+        
+        if not has_risk:
+            pytest.skip("Risk keywords not clearly present - may need investigation")
+
+
+# ============================================================================
+# TEST CLASS 6: Commercial Segment Focus Verification (tool results)
+# ============================================================================
+
+class TestCommercialSegmentFocus:
+    """
+    Verify the competitive positioning tool output stays on Commercial Lines.
+    """
+    
+    @pytest.mark.slow
+    def test_competitive_analysis_excludes_personal_lines(
+        self, all_tool_results
+    ):
+        """Test competitive positioning excludes personal lines."""
+        result = all_tool_results["competitive_positioning"]
+        
+        # Should not mention personal lines
+        has_personal = _mentions(result, _PERSONAL_LINES_RE)
+        
+        # Don't hard fail - could be mentioned in context of exclusion
+        if has_personal:
+            pytest.skip(
+                "Personal lines mentioned - verify it's in exclusion context"
+            )